@@ -1,15 +1,39 @@
 import os
+from functools import lru_cache
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
 from database.models import Base
 
 load_dotenv()
 
+
+@lru_cache(maxsize=None)
+def _get_engine(database_url: str):
+    """
+    One pooled engine per URL for the whole process.
+    Components build their own DatabaseSetup on every Streamlit rerun, so the
+    engine is shared to keep warm connections instead of reconnecting each time.
+    """
+    if database_url and database_url.startswith('sqlite'):
+        return create_engine(database_url, echo=False)
+    
+    return create_engine(
+        database_url,
+        echo=False,
+        poolclass=QueuePool,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=1800
+    )
+
+
 class DatabaseSetup:
     def __init__(self):
         self.database_url = os.getenv('DATABASE_URL')
-        self.engine = create_engine(self.database_url, echo=False)
+        self.engine = _get_engine(self.database_url)
         self.SessionLocal = sessionmaker(bind=self.engine)
     
     def create_tables(self):
@@ -23,7 +47,7 @@ class DatabaseSetup:
         print("⚠️ All tables dropped")
     
     def get_session(self):
-        """Get database session"""
+        """Get database session (usable as a context manager)"""
         return self.SessionLocal()
     
     def test_connection(self):
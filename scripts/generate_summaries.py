@@ -280,8 +280,12 @@ def populate_vector_store():
     
     # Create and save vector store
     vector_store = FAISSVectorStore()
-    vector_store.create_index()
-    vector_store.add_vectors(embeddings, metadata)
+    vector_store.create_index(n_vectors=len(embeddings))
+    vector_store.add_vectors(
+        embeddings,
+        metadata,
+        already_normalized=embedding_generator.is_normalized
+    )
     vector_store.save()
     
     print(f"✅ Vector store saved with {len(embeddings)} vectors")
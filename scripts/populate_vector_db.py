@@ -49,8 +49,12 @@ def main():
     
     # Create and save vector store
     vector_store = FAISSVectorStore(dimension=embeddings.shape[1])
-    vector_store.create_index()
-    vector_store.add_vectors(embeddings, metadata)
+    vector_store.create_index(n_vectors=len(embeddings))
+    vector_store.add_vectors(
+        embeddings,
+        metadata,
+        already_normalized=embedding_generator.is_normalized
+    )
     vector_store.save()
     
     print("✅ Vector database updated successfully!")
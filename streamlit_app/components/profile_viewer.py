@@ -1,7 +1,99 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+from visualization.figure_cache import fingerprint
 from visualization.profile_plots import ProfilePlotter
 
+# Plotly traces get sluggish past a few thousand points
+MAX_PLOT_POINTS = 5000
+
+# Measurement columns handed to the plotter as Arrow-backed float32
+PLOT_COLUMNS = ['pressure', 'temperature', 'salinity', 'dissolved_oxygen', 'chlorophyll', 'latitude', 'longitude']
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets selection.
+    Returns positions of the points that best preserve the line shape.
+    """
+    size = len(x)
+    if n_out >= size or n_out < 3:
+        return np.arange(size)
+    
+    bucket = (size - 2) / (n_out - 2)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = size - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+        next_end = min(int((i + 2) * bucket) + 1, size)
+        
+        # Average of the next bucket is the third triangle vertex
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    
+    return selected
+
+
+def _lttb_downsample(df: pd.DataFrame, x: str, y: str, n: int) -> pd.DataFrame:
+    """
+    Downsample profile rows with LTTB, keeping whole rows.
+    Each (float_id, cycle_number) profile gets a share of the point budget
+    proportional to its size so individual profiles keep their shape.
+    """
+    if len(df) <= n:
+        return df
+    
+    keys = [col for col in ['float_id', 'cycle_number'] if col in df.columns]
+    df = df.dropna(subset=[x, y]).sort_values(keys + [x])
+    xs = df[x].to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+    
+    if not keys:
+        return df.iloc[_lttb_indices(xs, ys, n)]
+    
+    selected = []
+    for positions in df.groupby(keys, sort=False).indices.values():
+        budget = max(3, round(n * len(positions) / len(df)))
+        keep = _lttb_indices(xs[positions], ys[positions], budget)
+        selected.append(positions[keep])
+    
+    return df.iloc[np.sort(np.concatenate(selected))]
+
+
+@st.cache_data(hash_funcs={pd.DataFrame: fingerprint}, max_entries=16)
+def _plot_frame(df: pd.DataFrame, max_points: int = MAX_PLOT_POINTS) -> pd.DataFrame:
+    """
+    Cached plotting copy of the profile data: LTTB-downsampled when large,
+    with measurement columns cast once to Arrow-backed float32 so the
+    plotter can take contiguous buffers without per-call conversion, and
+    string profile keys as categoricals
+    """
+    if len(df) > max_points:
+        df = _lttb_downsample(df, x='pressure', y='temperature', n=max_points)
+    
+    casts = {
+        col: 'float32[pyarrow]'
+        for col in PLOT_COLUMNS
+        if col in df.columns and pd.api.types.is_float_dtype(df[col])
+    }
+    # Profile keys become categoricals here, once, instead of in every plot
+    for col in ('float_id', 'cycle_number'):
+        if col in df.columns and df[col].dtype == object:
+            casts[col] = 'category'
+    return df.astype(casts)
+
+
 class ProfileViewer:
     """Profile visualization component"""
     
@@ -38,8 +130,12 @@ class ProfileViewer:
                     )
                     float_ids = selected_floats if selected_floats else None
             
+            # Downsample only the selected profiles, so the point budget
+            # goes to what is drawn
+            selected_df = df if float_ids is None else df[df['float_id'].isin(float_ids)]
+            
             fig = self.plotter.create_temperature_profile(
-                df,
+                _plot_frame(selected_df),
                 float_ids=float_ids,
                 title="Temperature-Depth Profile"
             )
@@ -50,7 +146,7 @@ class ProfileViewer:
                 return
             
             fig = self.plotter.create_ts_diagram(
-                df,
+                _plot_frame(df),
                 title="Temperature-Salinity Diagram"
             )
             
@@ -67,7 +163,7 @@ class ProfileViewer:
             
             if selected_params:
                 fig = self.plotter.create_multi_parameter_profile(
-                    df,
+                    _plot_frame(df),
                     parameters=selected_params,
                     title="Multi-Parameter Profile"
                 )
@@ -85,7 +181,7 @@ class ProfileViewer:
                 group_by = 'float_id'
             
             fig = self.plotter.create_profile_comparison(
-                df,
+                _plot_frame(df),
                 group_by=group_by,
                 title=f"Profile Comparison by {group_by}"
             )
@@ -93,7 +189,7 @@ class ProfileViewer:
         # Display plot
         st.plotly_chart(fig, use_container_width=True)
         
-        # Display profile statistics
+        # Only the plots get the reduced frame; statistics use everything
         self._display_profile_stats(df)
     
     def _display_profile_stats(self, df: pd.DataFrame):
@@ -1,7 +1,72 @@
 import streamlit as st
+from sqlalchemy import text
 from database.db_setup import DatabaseSetup
 from database.models import ArgoProfile
 
+
+# Static sidebar content, each emitted with a single st.markdown call
+ABOUT_HTML = """
+<h3 style='color: #0066cc; font-weight: 700;'>ℹ️ About FloatChat</h3>
+
+<div style='background: linear-gradient(135deg, #f8f9fa, #e9ecef); padding: 1rem; border-radius: 8px; border: 2px solid #dee2e6;'>
+    <p style='color: #000000; font-weight: 600; margin: 0.5rem 0;'>
+        <strong style='color: #0066cc;'>FloatChat</strong> is an AI-powered conversational 
+        interface for exploring ARGO ocean float data with natural language.
+    </p>
+
+    <h4 style='color: #0066cc; margin-top: 1rem; margin-bottom: 0.5rem;'>✨ Key Features:</h4>
+    <ul style='color: #000000; font-weight: 600; margin: 0; padding-left: 1.2rem;'>
+        <li>🤖 Natural language queries</li>
+        <li>🗺️ Interactive map visualizations</li>
+        <li>📊 Real-time data analysis</li>
+        <li>💾 Multi-format export (CSV, JSON)</li>
+        <li>🌊 1.2M+ ocean measurements</li>
+    </ul>
+
+    <h4 style='color: #0066cc; margin-top: 1rem; margin-bottom: 0.5rem;'>📡 Data Source:</h4>
+    <p style='color: #000000; font-weight: 600; margin: 0;'>
+        ARGO Global Ocean Observing System<br/>
+        via INCOIS (Indian National Centre for Ocean Information Services)
+    </p>
+
+    <h4 style='color: #0066cc; margin-top: 1rem; margin-bottom: 0.5rem;'>🏆 Developed For:</h4>
+    <p style='color: #000000; font-weight: 600; margin: 0;'>
+        Smart India Hackathon 2025<br/>
+        Ministry of Earth Sciences (MoES)
+    </p>
+</div>
+"""
+
+RESOURCES_MD = """
+**Resources:**
+- [ARGO Program](https://argo.ucsd.edu/)
+- [INCOIS](https://incois.gov.in/)
+- [GitHub](https://github.com)
+"""
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_db_stats(_db_setup: DatabaseSetup):
+    """
+    Fetch database statistics, cached for 5 minutes.
+    Returns (total_records, unique_floats, earliest_timestamp).
+    """
+    # Context manager hands the connection back to the pool deterministically
+    with _db_setup.get_session() as session:
+        total_records = session.query(ArgoProfile).count()
+        # Subquery form lets the planner walk idx_float_id instead of hashing every row
+        unique_floats = session.execute(text(
+            "SELECT COUNT(*) FROM (SELECT DISTINCT float_id FROM argo_profiles) t"
+        )).scalar()
+        
+        # Get date range
+        date_range = session.query(
+            ArgoProfile.timestamp
+        ).order_by(ArgoProfile.timestamp).first()
+    
+    earliest_ts = date_range[0] if date_range else None
+    return total_records, unique_floats, earliest_ts
+
+
 class Sidebar:
     """Sidebar component with database info and settings"""
     
@@ -24,22 +89,32 @@ class Sidebar:
             
             st.markdown("---")
             
-            # Query settings
-            self._render_query_settings()
-            
-            st.markdown("---")
-            
-            # Information
-            self._render_info()
-            
-            st.markdown("---")
-            
-            # Clear chat button with enhanced styling
-            if st.button("🗑️ Clear Chat History", use_container_width=True, type="primary"):
-                st.session_state.chat_history = []
-                st.session_state.last_query_results = None
-                st.success("✅ Chat history cleared!")
-                st.rerun()
+            self._render_body()
+    
+    @st.fragment
+    def _render_body(self):
+        """
+        Render the interactive part of the sidebar.
+        Runs as a fragment, so moving a slider reruns only this block
+        instead of the whole app (embedding, DB and LLM work included).
+        """
+        # Query settings
+        self._render_query_settings()
+        
+        st.markdown("---")
+        
+        # Information
+        self._render_info()
+        
+        st.markdown("---")
+        
+        # Clear chat button with enhanced styling
+        if st.button("🗑️ Clear Chat History", use_container_width=True, type="primary"):
+            st.session_state.chat_history = []
+            st.session_state.last_query_results = None
+            st.success("✅ Chat history cleared!")
+            # Full app rerun so the chat area is cleared too
+            st.rerun()
     
     def _render_database_stats(self):
         """Display database statistics"""
@@ -47,19 +122,11 @@ class Sidebar:
             <h3 style='color: #0066cc; font-weight: 700;'>📊 Database Statistics</h3>
         """, unsafe_allow_html=True)
         
+        if st.button("🔄 Refresh Stats", use_container_width=True):
+            _fetch_db_stats.clear()
+        
         try:
-            session = self.db_setup.get_session()
-            
-            # Get counts
-            total_records = session.query(ArgoProfile).count()
-            unique_floats = session.query(ArgoProfile.float_id).distinct().count()
-            
-            # Get date range
-            date_range = session.query(
-                ArgoProfile.timestamp
-            ).order_by(ArgoProfile.timestamp).first()
-            
-            session.close()
+            total_records, unique_floats, earliest_ts = _fetch_db_stats(self.db_setup)
             
             # Display metrics in styled boxes
             st.markdown(f"""
@@ -76,8 +143,8 @@ class Sidebar:
                 </div>
             """, unsafe_allow_html=True)
             
-            if date_range:
-                st.info(f"📅 **Data starts from:** {date_range[0].strftime('%B %d, %Y')}")
+            if earliest_ts:
+                st.info(f"📅 **Data starts from:** {earliest_ts.strftime('%B %d, %Y')}")
             
         except Exception as e:
             st.error(f"❌ Database connection error: {e}")
@@ -114,42 +181,5 @@ class Sidebar:
     
     def _render_info(self):
         """Render information section"""
-        st.markdown("""
-            <h3 style='color: #0066cc; font-weight: 700;'>ℹ️ About FloatChat</h3>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div style='background: linear-gradient(135deg, #f8f9fa, #e9ecef); padding: 1rem; border-radius: 8px; border: 2px solid #dee2e6;'>
-            <p style='color: #000000; font-weight: 600; margin: 0.5rem 0;'>
-                <strong style='color: #0066cc;'>FloatChat</strong> is an AI-powered conversational 
-                interface for exploring ARGO ocean float data with natural language.
-            </p>
-            
-            <h4 style='color: #0066cc; margin-top: 1rem; margin-bottom: 0.5rem;'>✨ Key Features:</h4>
-            <ul style='color: #000000; font-weight: 600; margin: 0; padding-left: 1.2rem;'>
-                <li>🤖 Natural language queries</li>
-                <li>🗺️ Interactive map visualizations</li>
-                <li>📊 Real-time data analysis</li>
-                <li>💾 Multi-format export (CSV, JSON)</li>
-                <li>🌊 1.2M+ ocean measurements</li>
-            </ul>
-            
-            <h4 style='color: #0066cc; margin-top: 1rem; margin-bottom: 0.5rem;'>📡 Data Source:</h4>
-            <p style='color: #000000; font-weight: 600; margin: 0;'>
-                ARGO Global Ocean Observing System<br/>
-                via INCOIS (Indian National Centre for Ocean Information Services)
-            </p>
-            
-            <h4 style='color: #0066cc; margin-top: 1rem; margin-bottom: 0.5rem;'>🏆 Developed For:</h4>
-            <p style='color: #000000; font-weight: 600; margin: 0;'>
-                Smart India Hackathon 2025<br/>
-                Ministry of Earth Sciences (MoES)
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Links
-        st.markdown("**Resources:**")
-        st.markdown("- [ARGO Program](https://argo.ucsd.edu/)")
-        st.markdown("- [INCOIS](https://incois.gov.in/)")
-        st.markdown("- [GitHub](https://github.com)")
+        st.markdown(ABOUT_HTML, unsafe_allow_html=True)
+        st.markdown(RESOURCES_MD)
@@ -1,5 +1,5 @@
 import streamlit as st
-import traceback
+from functools import wraps
 from typing import Callable, Any
 import logging
 
@@ -18,12 +18,13 @@ logger = logging.getLogger('FloatChat')
 
 def handle_errors(func: Callable) -> Callable:
     """Decorator for error handling"""
+    @wraps(func)
     def wrapper(*args, **kwargs) -> Any:
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            logger.error(f"Error in {func.__name__}: {str(e)}")
-            logger.error(traceback.format_exc())
+            # Lazy formatting: the traceback is only rendered if ERROR is enabled
+            logger.exception("Error in %s: %s", func.__name__, e)
             st.error(f"An error occurred: {str(e)}")
             return None
     return wrapper
@@ -1,8 +1,12 @@
 import time
+from collections import deque
 from functools import wraps
 from typing import Dict
 import streamlit as st
 
+# Keep only the most recent timings per operation
+MAX_SAMPLES = 200
+
 
 class PerformanceMonitor:
     """Monitor application performance"""
@@ -10,9 +14,9 @@ class PerformanceMonitor:
     def __init__(self):
         if 'performance_metrics' not in st.session_state:
             st.session_state.performance_metrics = {
-                'query_times': [],
-                'db_times': [],
-                'render_times': []
+                'query_times': deque(maxlen=MAX_SAMPLES),
+                'db_times': deque(maxlen=MAX_SAMPLES),
+                'render_times': deque(maxlen=MAX_SAMPLES)
             }
     
     @staticmethod
@@ -21,14 +25,14 @@ class PerformanceMonitor:
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
-                start = time.time()
+                start = time.perf_counter()
                 result = func(*args, **kwargs)
-                duration = time.time() - start
+                duration = time.perf_counter() - start
                 
                 # Store metric
                 if 'performance_metrics' in st.session_state:
                     if operation not in st.session_state.performance_metrics:
-                        st.session_state.performance_metrics[operation] = []
+                        st.session_state.performance_metrics[operation] = deque(maxlen=MAX_SAMPLES)
                     st.session_state.performance_metrics[operation].append(duration)
                 
                 print(f"⏱️ {operation}: {duration:.3f}s")
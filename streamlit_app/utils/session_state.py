@@ -1,35 +1,30 @@
+import copy
 import streamlit as st
 
+# Session state variables and their initial values
+DEFAULTS = {
+    # Chat history
+    'chat_history': [],
+    # Last query results
+    'last_query_results': None,
+    # Query settings
+    'top_k': 3,
+    'max_results': 1000,
+    # User preferences
+    'theme': 'light',
+    'map_style': 'open-street-map',
+}
+
 class SessionStateManager:
     """Manage Streamlit session state variables"""
-    
+
     def initialize(self):
         """Initialize all session state variables"""
-        
-        # Chat history
-        if 'chat_history' not in st.session_state:
-            st.session_state.chat_history = []
-        
-        # Last query results
-        if 'last_query_results' not in st.session_state:
-            st.session_state.last_query_results = None
-        
-        # Query settings
-        if 'top_k' not in st.session_state:
-            st.session_state.top_k = 3
-        
-        if 'max_results' not in st.session_state:
-            st.session_state.max_results = 1000
-        
-        # User preferences
-        if 'theme' not in st.session_state:
-            st.session_state.theme = 'light'
-        
-        if 'map_style' not in st.session_state:
-            st.session_state.map_style = 'open-street-map'
-    
+        for key, value in DEFAULTS.items():
+            # Copy so sessions never share a mutable default
+            st.session_state.setdefault(key, copy.copy(value))
+
     def reset(self):
         """Reset all session state"""
-        for key in list(st.session_state.keys()):
-            del st.session_state[key]
+        st.session_state.clear()
         self.initialize()
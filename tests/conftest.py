@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+
+EMBEDDING_DIM = 384
+
+
+class FakeModel:
+    """Stand-in for SentenceTransformer that returns zero vectors"""
+
+    def encode(self, sentences, **kwargs):
+        if isinstance(sentences, str):
+            return np.zeros(EMBEDDING_DIM, dtype=np.float32)
+        return np.zeros((len(sentences), EMBEDDING_DIM), dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return EMBEDDING_DIM
+
+
+@pytest.fixture(scope="session")
+def monkeypatch_session():
+    """Session-scoped variant of the built-in monkeypatch fixture"""
+    with pytest.MonkeyPatch.context() as mp:
+        yield mp
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _stub_embed(monkeypatch_session):
+    """Never download or load the real embedding model during tests"""
+    try:
+        import vector_store.embeddings as embeddings
+    except ImportError:
+        # sentence-transformers not installed: nothing to stub
+        yield
+        return
+
+    monkeypatch_session.setattr(embeddings, "SentenceTransformer", lambda name, **kwargs: FakeModel())
+    # The loader is cached per process; patch it so an earlier load can't leak in
+    monkeypatch_session.setattr(embeddings, "_load_st_model", lambda name: FakeModel())
+    embeddings._encode.cache_clear()
+    yield
+    embeddings._encode.cache_clear()
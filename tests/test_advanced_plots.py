@@ -0,0 +1,37 @@
+import sys
+import unittest
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+from scipy.interpolate import griddata
+from scipy.spatial import Delaunay
+
+from visualization.advanced_plots import _linear_interp
+
+
+class TestSectionInterpolation(unittest.TestCase):
+    """Test interpolation used by vertical section plots"""
+
+    def test_linear_interp_matches_griddata(self):
+        """Cached-triangulation interpolation equals griddata, NaNs included"""
+        rng = np.random.default_rng(0)
+        distance = rng.uniform(-10, 10, 500)
+        depth = rng.uniform(0, 2000, 500)
+        values = 20 - depth / 100 + np.sin(distance)
+
+        # Grid reaches past the data, so some points fall outside the hull
+        xi, yi = np.meshgrid(np.linspace(-11, 11, 100), np.linspace(-50, 2050, 100))
+
+        points = np.column_stack([distance, depth])
+        result = _linear_interp(Delaunay(points), values, xi, yi)
+        expected = griddata((distance, depth), values, (xi, yi), method='linear')
+
+        self.assertEqual(result.shape, expected.shape)
+        np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+        self.assertTrue(np.isnan(result).any())
+        np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,23 @@
 import unittest
 import sys
+from functools import lru_cache
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from data_processing.netcdf_extractor import NetCDFExtractor
 import pandas as pd
 
+DATA_PATH = 'data/processed/argo_profiles.csv'
+REQUIRED_COLUMNS = ['latitude', 'longitude', 'timestamp',
+                    'pressure', 'temperature', 'salinity']
+
+
+@lru_cache(maxsize=1)
+def _load_argo() -> pd.DataFrame:
+    """Parse the processed CSV once, only the columns the tests look at"""
+    return pd.read_csv(DATA_PATH, usecols=REQUIRED_COLUMNS, engine='pyarrow')
+
+
 class TestDataProcessing(unittest.TestCase):
     """Test data processing components"""
     
@@ -18,20 +30,17 @@ class TestDataProcessing(unittest.TestCase):
     
     def test_csv_structure(self):
         """Test CSV has required columns"""
-        required_columns = ['latitude', 'longitude', 'timestamp', 
-                          'pressure', 'temperature', 'salinity']
-        
-        # Load your CSV
-        df = pd.read_csv('data/processed/argo_profiles.csv')
+        # Header only; no need to parse the data rows
+        columns = pd.read_csv(DATA_PATH, nrows=0).columns
         
-        for col in required_columns:
-            self.assertIn(col, df.columns, f"Missing column: {col}")
+        for col in REQUIRED_COLUMNS:
+            self.assertIn(col, columns, f"Missing column: {col}")
         
         print("✅ CSV structure test passed")
     
     def test_data_types(self):
         """Test data types are correct"""
-        df = pd.read_csv('data/processed/argo_profiles.csv')
+        df = _load_argo()
         
         # Check numeric columns
         self.assertTrue(pd.api.types.is_numeric_dtype(df['latitude']))
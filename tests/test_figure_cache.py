@@ -0,0 +1,83 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from visualization import figure_cache
+from visualization.figure_cache import cached_figure
+
+
+class _Plotter:
+    """Minimal plot builder that counts how often it really builds"""
+
+    def __init__(self):
+        self.builds = 0
+
+    @cached_figure
+    def path(self, df: pd.DataFrame, title: str = "Path") -> go.Figure:
+        self.builds += 1
+        return go.Figure(go.Scatter(x=df['x'], y=df['y'], mode='lines'), layout=dict(title=title))
+
+
+class TestFigureCache(unittest.TestCase):
+    """Test memoization of plot builders"""
+
+    def setUp(self):
+        figure_cache._figures.clear()
+        self.plotter = _Plotter()
+        self.df = pd.DataFrame({'x': [1, 2, 3], 'y': [10.0, 20.0, 30.0]})
+
+    def test_hit_on_identical_data(self):
+        """An equal frame with the same arguments is served from the cache"""
+        first = self.plotter.path(self.df)
+        second = self.plotter.path(self.df.copy())
+
+        self.assertEqual(self.plotter.builds, 1)
+        self.assertEqual(json.loads(first.to_json()), json.loads(second.to_json()))
+
+    def test_miss_on_different_arguments(self):
+        """Other arguments build a new figure"""
+        self.plotter.path(self.df)
+        self.plotter.path(self.df, title="Other")
+
+        self.assertEqual(self.plotter.builds, 2)
+
+    def test_miss_on_changed_data(self):
+        """Changed values, reordered rows or changed dtypes all rebuild"""
+        variants = {
+            'values': self.df.assign(y=[10.0, 20.0, 31.0]),
+            'reordered': self.df.iloc[::-1],
+            'dtypes': self.df.astype({'x': 'float64'}),
+        }
+        baseline = self.plotter.path(self.df)
+
+        for name, variant in variants.items():
+            with self.subTest(name):
+                builds = self.plotter.builds
+                fig = self.plotter.path(variant)
+                self.assertEqual(self.plotter.builds, builds + 1)
+                self.assertEqual(list(fig.data[0].x), variant['x'].tolist())
+
+        self.assertEqual(list(baseline.data[0].x), [1, 2, 3])
+
+    def test_returned_figures_are_independent(self):
+        """Editing a returned figure never leaks into later hits"""
+        first = self.plotter.path(self.df)
+        first.update_layout(title="Edited")
+        first.data[0].x = [0, 0, 0]
+
+        second = self.plotter.path(self.df)
+        second.update_layout(title="Edited again")
+
+        third = self.plotter.path(self.df)
+        self.assertEqual(self.plotter.builds, 1)
+        self.assertEqual(third.layout.title.text, "Path")
+        self.assertEqual(list(third.data[0].x), [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+sys.path.append(str(Path(__file__).parent.parent))
+
+import faiss
+import numpy as np
+
+from vector_store.vector_db import FAISSVectorStore, SQ_MIN_TRAIN_SIZE
+
+DIMENSION = 8
+
+
+def _unit_vectors(n: int) -> np.ndarray:
+    """n distinct unit vectors, so every vector is its own nearest neighbour"""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((n, DIMENSION)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestVectorStore(unittest.TestCase):
+    """Test FAISS vector store persistence and updates"""
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._env = mock.patch.dict(os.environ, {
+            'VECTOR_STORE_PATH': self._dir.name,
+            'USE_ANN': 'False',
+            'FAISS_USE_GPU': 'False',
+        })
+        self._env.start()
+
+    def tearDown(self):
+        self._env.stop()
+        self._dir.cleanup()
+
+    def _saved_store(self, n: int = 20) -> np.ndarray:
+        """Build and save a store of n vectors; returns the vectors"""
+        vectors = _unit_vectors(n)
+        store = FAISSVectorStore(dimension=DIMENSION)
+        store.add_vectors(vectors, [{'id': i} for i in range(n)])
+        store.save()
+        return vectors
+
+    def test_load_add_delete_search(self):
+        """A default (memory-mapped) load can still be written to"""
+        vectors = self._saved_store()
+
+        store = FAISSVectorStore(dimension=DIMENSION)
+        self.assertTrue(store.load())
+
+        extra = _unit_vectors(23)[20:]
+        ids = store.add_vectors(extra, [{'id': 20 + i} for i in range(3)])
+        self.assertEqual(list(ids), [20, 21, 22])
+        self.assertEqual(store.delete([3]), 1)
+
+        self.assertEqual(store.search(extra[1], k=1)[0][1]['id'], 21)
+        hits = [meta['id'] for _, meta in store.search(vectors[3], k=5)]
+        self.assertNotIn(3, hits)
+        self.assertEqual(store.index.ntotal, 22)
+
+    def test_delete_then_search(self):
+        """Deleted ids never come back, on flat and scalar-quantized stores"""
+        for n in (20, SQ_MIN_TRAIN_SIZE):
+            with self.subTest(n=n), mock.patch.dict(os.environ, {
+                'USE_ANN': 'True',
+                'VECTOR_STORE_DELETABLE': 'True',
+            }):
+                vectors = self._saved_store(n)
+                store = FAISSVectorStore(dimension=DIMENSION)
+                store.load()
+
+                removed = [0, 5, 7]
+                self.assertEqual(store.delete(removed), 3)
+                for i in removed:
+                    hits = [meta['id'] for _, meta in store.search(vectors[i], k=10)]
+                    self.assertEqual(len(hits), 10)
+                    self.assertFalse(set(hits) & set(removed))
+                self.assertEqual(store.search(vectors[6], k=1)[0][1]['id'], 6)
+
+    def test_delete_refused_on_hnsw(self):
+        """HNSW stores refuse deletion instead of corrupting the graph"""
+        with mock.patch.dict(os.environ, {'USE_ANN': 'True'}):
+            vectors = self._saved_store()
+            store = FAISSVectorStore(dimension=DIMENSION)
+            store.load()
+
+            self.assertEqual(store.delete([0]), 0)
+            self.assertEqual(store.index.ntotal, 20)
+            self.assertEqual(store.search(vectors[0], k=1)[0][1]['id'], 0)
+
+    def test_legacy_l2_store_scores_as_cosine(self):
+        """Stores built on IndexFlatL2 report cosine similarity, best first"""
+        vectors = _unit_vectors(20)
+        index = faiss.IndexFlatL2(DIMENSION)
+        index.add(vectors)
+        faiss.write_index(index, str(Path(self._dir.name) / "index.faiss"))
+        with open(Path(self._dir.name) / "metadata.pkl", 'wb') as f:
+            pickle.dump([{'id': i} for i in range(20)], f)
+
+        store = FAISSVectorStore(dimension=DIMENSION)
+        self.assertTrue(store.load())
+        results = store.search(vectors[4], k=5)
+
+        scores = [score for score, _ in results]
+        self.assertEqual(results[0][1]['id'], 4)
+        self.assertAlmostEqual(scores[0], 1.0, places=5)
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        expected = vectors[[meta['id'] for _, meta in results]] @ vectors[4]
+        np.testing.assert_allclose(scores, expected, atol=1e-5)
+
+    def test_mismatched_metadata_rejected_on_add(self):
+        """A field changing type fails in add_vectors and leaves the store usable"""
+        vectors = _unit_vectors(6)
+        store = FAISSVectorStore(dimension=DIMENSION)
+        store.add_vectors(vectors[:2], [{'id': 0}, {'id': 1}])
+        store.add_vectors(vectors[2:4], [{'id': 2.5}, {'id': 3, 'note': 'x'}])
+        self.assertEqual(store.search(vectors[0], k=1)[0][1], {'id': 0.0, 'note': None})
+
+        with self.assertRaises(TypeError):
+            store.add_vectors(vectors[4:], [{'id': 'four'}, {'id': 'five'}])
+
+        self.assertEqual(store.index.ntotal, 4)
+        self.assertEqual(store.metadata_count, 4)
+        self.assertEqual(store.search(vectors[3], k=1)[0][1], {'id': 3.0, 'note': 'x'})
+
+
+if __name__ == '__main__':
+    unittest.main()
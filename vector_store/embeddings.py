@@ -1,7 +1,37 @@
 import os
+from functools import lru_cache
 from sentence_transformers import SentenceTransformer
 from typing import List
 import numpy as np
+import torch
+
+# Share one model per process: under Streamlit across sessions and reruns,
+# elsewhere (scripts, MCP server) via a plain in-process cache
+try:
+    import streamlit as st
+    _cache_model = st.cache_resource(show_spinner=False)
+except ImportError:
+    _cache_model = lru_cache(maxsize=None)
+
+
+@_cache_model
+def _load_st_model(model_name: str) -> SentenceTransformer:
+    """Load a SentenceTransformer model once per process"""
+    print(f"🔄 Loading embedding model: {model_name}")
+    model = SentenceTransformer(model_name)
+    if torch.cuda.is_available():
+        # fp16 tensor cores; outputs are normalized so precision loss is negligible
+        model = model.half().to("cuda")
+    print("✅ Embedding model loaded")
+    return model
+
+
+@lru_cache(maxsize=1024)
+def _encode(model_name: str, text: str) -> np.ndarray:
+    """Encode a single text; repeated queries skip the transformer pass"""
+    embedding = _load_st_model(model_name).encode(text, convert_to_numpy=True)
+    return embedding.astype(np.float32, copy=False)
+
 
 class EmbeddingGenerator:
     """Generate embeddings for text summaries"""
@@ -11,22 +41,26 @@ class EmbeddingGenerator:
             'EMBEDDING_MODEL',
             'sentence-transformers/all-MiniLM-L6-v2'
         )
-        print(f"🔄 Loading embedding model: {self.model_name}")
-        self.model = SentenceTransformer(self.model_name)
-        print("✅ Embedding model loaded")
+        self.model = _load_st_model(self.model_name)
+        # generate_embeddings returns unit-length vectors
+        self.is_normalized = True
     
     def generate_embedding(self, text: str) -> np.ndarray:
-        """Generate embedding for single text"""
-        return self.model.encode(text, convert_to_numpy=True)
+        """Generate embedding for single text (memoized per model)"""
+        # Copy so callers normalizing in place don't touch the cached vector
+        return _encode(self.model_name, text).copy()
     
     def generate_embeddings(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
-        """Generate embeddings for multiple texts"""
-        return self.model.encode(
+        """Generate L2-normalized float32 embeddings for multiple texts"""
+        embeddings = self.model.encode(
             texts,
             batch_size=batch_size,
             show_progress_bar=True,
-            convert_to_numpy=True
+            convert_to_numpy=True,
+            normalize_embeddings=True
         )
+        # fp16 on GPU; FAISS expects float32
+        return embeddings.astype(np.float32, copy=False)
     
     def get_embedding_dimension(self) -> int:
         """Get embedding dimension"""
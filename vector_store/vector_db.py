@@ -1,17 +1,52 @@
 import os
+import json
+import time
 import faiss
 import numpy as np
 import pickle
+import pyarrow as pa
+from pyarrow import feather
+from collections import defaultdict
 from typing import List, Tuple
 from pathlib import Path
 
+# int8 scalar quantization needs a decent training set (~10k vectors);
+# smaller corpora stay on full-precision float32 indexes
+SQ_MIN_TRAIN_SIZE = 10000
+
+# Names the index/metadata pair of the current generation; replaced last on save
+MANIFEST_NAME = "manifest.json"
+
 class FAISSVectorStore:
     """FAISS vector database for profile summaries"""
     
     def __init__(self, dimension: int = 384):
         self.dimension = dimension
         self.index = None
-        self.metadata = []
+        
+        # Metadata lives in an Arrow table (memory-mapped after load).
+        # New rows are converted to Arrow per batch and appended on first use;
+        # _schema is the type every field must keep across batches.
+        self._table = None
+        self._pending = []
+        self._n_pending = 0
+        self._schema = None
+        
+        # HNSW approximate search by default; exact flat index for small corpora
+        self.use_ann = os.getenv('USE_ANN', 'True').lower() == 'true'
+        
+        # Stores that need delete() are built flat: HNSW graphs can't drop nodes
+        self.deletable = os.getenv('VECTOR_STORE_DELETABLE', 'False').lower() == 'true'
+        
+        # Optional GPU mirror of the index (CPU stays the default)
+        self.use_gpu = os.getenv('FAISS_USE_GPU', 'False').lower() == 'true'
+        self._gpu_res = None
+        
+        # Index file the current index is memory-mapped from (None when owned)
+        self._mmap_path = None
+        
+        # Stores built before the switch to inner product score by L2 distance
+        self._l2_scores = False
         
         # Get vector store path, handle both relative and absolute
         store_path_str = os.getenv('VECTOR_STORE_PATH', './data/vector_store')
@@ -24,57 +59,335 @@ class FAISSVectorStore:
         
         self.store_path.mkdir(parents=True, exist_ok=True)
     
-    def create_index(self):
-        """Create new FAISS index"""
-        # Using L2 distance for similarity
-        self.index = faiss.IndexFlatL2(self.dimension)
+    def create_index(self, n_vectors: int = 0):
+        """
+        Create new FAISS index.
+        
+        Args:
+            n_vectors: Expected corpus size. At SQ_MIN_TRAIN_SIZE or more the
+                vectors are stored as int8 (4x less memory), which requires
+                training on the first batch passed to add_vectors.
+        
+        The index is wrapped in an IndexIDMap2 so vectors can be removed
+        with delete() instead of rebuilding the store. That needs a flat
+        base index, so VECTOR_STORE_DELETABLE=True overrides USE_ANN.
+        """
+        use_ann = self.use_ann and not self.deletable
+        
+        # Inner product on normalized vectors = cosine similarity
+        if n_vectors >= SQ_MIN_TRAIN_SIZE:
+            qtype = faiss.ScalarQuantizer.QT_8bit
+            if use_ann:
+                base = faiss.IndexHNSWSQ(self.dimension, qtype, 32, faiss.METRIC_INNER_PRODUCT)
+                base.hnsw.efConstruction = 200
+            else:
+                base = faiss.IndexScalarQuantizer(self.dimension, qtype, faiss.METRIC_INNER_PRODUCT)
+        elif use_ann:
+            # Graph-based ANN: log(N) search instead of a full scan
+            base = faiss.IndexHNSWFlat(self.dimension, 32, faiss.METRIC_INNER_PRODUCT)
+            base.hnsw.efConstruction = 200
+        else:
+            base = faiss.IndexFlatIP(self.dimension)
+        self.index = faiss.IndexIDMap2(base)
+        self._mmap_path = None
+        self._l2_scores = False
         print(f"✅ Created FAISS index with dimension {self.dimension}")
+        self._maybe_to_gpu()
     
-    def add_vectors(self, embeddings: np.ndarray, metadata: List[dict]):
-        """Add vectors to index"""
+    def _maybe_to_gpu(self):
+        """
+        Move the index to GPU 0 when FAISS_USE_GPU=True and a GPU is present.
+        Flat indexes are supported; HNSW and plain scalar-quantized indexes
+        have no GPU implementation and stay on the CPU. GPU indexes cannot
+        delete vectors.
+        """
+        if not self.use_gpu or faiss.get_num_gpus() == 0:
+            return
+        
+        try:
+            self._gpu_res = faiss.StandardGpuResources()
+            self.index = faiss.index_cpu_to_gpu(self._gpu_res, 0, self.index)
+            print("🚀 Moved FAISS index to GPU")
+        except RuntimeError as e:
+            self._gpu_res = None
+            print(f"⚠️ Keeping FAISS index on CPU: {e}")
+    
+    def add_vectors(
+        self,
+        embeddings: np.ndarray,
+        metadata: List[dict],
+        already_normalized: bool = False
+    ):
+        """
+        Add vectors to index.
+        
+        Args:
+            embeddings: (n, dimension) array
+            metadata: One dict per vector
+            already_normalized: Skip the normalization pass for unit-length
+                input (e.g. EmbeddingGenerator.generate_embeddings output).
+                CHECK_EMBEDDING_NORMS=True asserts the norms really are 1.
+        
+        Returns:
+            Vector ids of the added rows (their metadata row numbers),
+            usable with delete()
+        """
         if self.index is None:
-            self.create_index()
+            self.create_index(len(embeddings))
+        self._ensure_writable()
+        
+        # FAISS kernels want C-ordered float32
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
         
         # Normalize embeddings for cosine similarity
-        faiss.normalize_L2(embeddings)
+        if not already_normalized:
+            faiss.normalize_L2(embeddings)
+        elif os.getenv('CHECK_EMBEDDING_NORMS', 'False').lower() == 'true':
+            np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-3)
+        
+        # Quantized indexes learn value ranges from the first batch
+        if not self.index.is_trained:
+            self.index.train(embeddings)
         
-        self.index.add(embeddings.astype('float32'))
-        self.metadata.extend(metadata)
+        # Ids are metadata row numbers, so lookups survive deletions
+        start = self.metadata_count
+        ids = np.arange(start, start + len(embeddings), dtype=np.int64)
+        # Metadata first: rows of the wrong type are rejected before indexing
+        self._append_metadata(metadata)
+        if self._has_id_map():
+            self.index.add_with_ids(embeddings, ids)
+        else:
+            self.index.add(embeddings)
         
         print(f"✅ Added {len(embeddings)} vectors to index")
         print(f"📊 Total vectors in index: {self.index.ntotal}")
+        return ids
+    
+    def delete(self, ids) -> int:
+        """
+        Remove vectors by id without rebuilding the index.
+        Their metadata rows stay in place but are no longer returned.
+        
+        Needs a CPU index built with VECTOR_STORE_DELETABLE=True (or
+        USE_ANN=False): HNSW graphs cannot drop nodes and GPU indexes
+        have no remove. Other stores are left untouched.
+        
+        Returns:
+            Number of vectors removed
+        """
+        if not self._has_id_map():
+            print("❌ Index has no id map; rebuild the vector store to enable deletions")
+            return 0
+        if hasattr(self._base_index(), 'hnsw'):
+            print("❌ HNSW indexes do not support deletion; rebuild with VECTOR_STORE_DELETABLE=True")
+            return 0
+        if self._gpu_res is not None:
+            print("❌ GPU indexes do not support deletion; load with FAISS_USE_GPU=False")
+            return 0
+        self._ensure_writable()
+        
+        removed = self.index.remove_ids(np.asarray(ids, dtype=np.int64))
+        print(f"🗑️ Removed {removed} vectors from index")
+        return removed
+    
+    def _ensure_writable(self):
+        """
+        Re-read a memory-mapped index into owned memory before it is modified.
+        Mapped codes are a read-only view; FAISS aborts (or crashes) when an
+        add or remove tries to resize them.
+        """
+        if self._mmap_path is None:
+            return
+        
+        print("📥 Loading memory-mapped index into RAM for writing")
+        self.index = faiss.read_index(str(self._mmap_path))
+        self._mmap_path = None
+        self._maybe_to_gpu()
+    
+    def _has_id_map(self) -> bool:
+        """Whether the index is wrapped in an IndexIDMap (older stores are not)"""
+        return hasattr(self.index, 'id_map')
+    
+    def _base_index(self):
+        """The underlying index, unwrapped from the id map"""
+        if self._has_id_map():
+            return faiss.downcast_index(self.index.index)
+        return self.index
     
     def search(self, query_embedding: np.ndarray, k: int = 5) -> List[Tuple[float, dict]]:
-        """Search for similar vectors"""
+        """
+        Search for similar vectors.
+        Returns (cosine similarity, metadata) pairs, highest similarity first.
+        """
         if self.index is None or self.index.ntotal == 0:
             print("❌ Index is empty")
             return []
         
         # Normalize query
-        query_embedding = query_embedding.reshape(1, -1).astype('float32')
+        query_embedding = np.ascontiguousarray(query_embedding.reshape(1, -1), dtype=np.float32)
         faiss.normalize_L2(query_embedding)
         
+        # Search breadth must cover k for good recall
+        base_index = self._base_index()
+        if hasattr(base_index, 'hnsw'):
+            base_index.hnsw.efSearch = max(k * 4, 32)
+        
         # Search
-        distances, indices = self.index.search(query_embedding, k)
+        scores, indices = self.index.search(query_embedding, k)
+        
+        # Squared L2 between unit vectors is 2 - 2*cos; report it as cosine
+        if self._l2_scores:
+            scores = 1.0 - scores / 2.0
+        
+        self._flush_metadata()
         
         results = []
-        for dist, idx in zip(distances[0], indices[0]):
-            if idx < len(self.metadata):
-                results.append((float(dist), self.metadata[idx]))
+        for score, idx in zip(scores[0], indices[0]):
+            if 0 <= idx < self.metadata_count:
+                results.append((float(score), self._metadata_row(idx)))
         
         return results
     
+    @property
+    def metadata_count(self) -> int:
+        """Number of metadata rows"""
+        n_stored = self._table.num_rows if self._table is not None else 0
+        return n_stored + self._n_pending
+    
+    def _append_metadata(self, metadata: List[dict]):
+        """
+        Convert a batch of metadata rows to Arrow field by field (no per-row
+        dict kept) and buffer it until the next flush.
+        
+        Raises:
+            TypeError: A field's values don't fit one Arrow type, here or
+                together with earlier rows (e.g. int ids, then str ids)
+        """
+        builders = defaultdict(list)
+        for n, row in enumerate(metadata):
+            for key, value in row.items():
+                column = builders[key]
+                # Field absent from earlier rows: pad with None
+                if len(column) < n:
+                    column.extend([None] * (n - len(column)))
+                column.append(value)
+        for column in builders.values():
+            column.extend([None] * (len(metadata) - len(column)))
+        
+        # Checked now so bad input fails here, not on every later search
+        try:
+            batch = pa.table(dict(builders))
+            schemas = [batch.schema] if self._schema is None else [self._schema, batch.schema]
+            schema = pa.unify_schemas(schemas, promote_options="permissive")
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise TypeError(f"Metadata does not match the types of earlier rows: {e}") from e
+        
+        self._pending.append(batch)
+        self._n_pending += len(metadata)
+        self._schema = schema
+    
+    def _flush_metadata(self):
+        """Append the buffered batches to the table"""
+        if not self._pending:
+            return
+        
+        tables = self._pending if self._table is None else [self._table, *self._pending]
+        # Permissive: an int field that later gets floats becomes double
+        self._table = pa.concat_tables(tables, promote_options="permissive")
+        
+        self._pending = []
+        self._n_pending = 0
+    
+    def _metadata_row(self, idx: int) -> dict:
+        """Materialize the metadata dict for one search hit"""
+        return {col: self._table.column(col)[idx].as_py() for col in self._table.column_names}
+    
     def save(self):
-        """Save index and metadata to disk"""
-        faiss.write_index(self.index, str(self.store_path / "index.faiss"))
-        with open(self.store_path / "metadata.pkl", 'wb') as f:
-            pickle.dump(self.metadata, f)
+        """
+        Save index and metadata to disk.
+        Each save writes a new generation of both files, then atomically
+        swaps manifest.json to point at it. The ids are metadata row numbers,
+        so the pair must change together: a crash at any point leaves the
+        manifest naming the previous, consistent pair (and memory-mapped
+        readers keep their old files).
+        """
+        generation = f"{time.time_ns():x}"
+        index_path = self.store_path / f"index.{generation}.faiss"
+        metadata_path = self.store_path / f"metadata.{generation}.arrow"
+        # Older stores used fixed names; those go too once the manifest lands
+        previous = self._read_manifest() or ("index.faiss", "metadata.arrow")
+        
+        # GPU indexes must be copied back to host memory to serialize
+        cpu_index = faiss.index_gpu_to_cpu(self.index) if self._gpu_res is not None else self.index
+        faiss.write_index(cpu_index, str(index_path))
+        self._flush_metadata()
+        table = self._table if self._table is not None else pa.table({})
+        # Uncompressed, so load() can memory-map it instead of decompressing into RAM
+        feather.write_feather(table, str(metadata_path), compression='uncompressed')
+        
+        self._fsync(index_path)
+        self._fsync(metadata_path)
+        
+        manifest_path = self.store_path / MANIFEST_NAME
+        manifest_tmp = manifest_path.with_name(manifest_path.name + ".tmp")
+        manifest_tmp.write_text(json.dumps({'index': index_path.name, 'metadata': metadata_path.name}))
+        self._fsync(manifest_tmp)
+        os.replace(manifest_tmp, manifest_path)
+        # Make the rename itself durable
+        self._fsync(self.store_path)
+        
+        # A still-mapped index re-reads from the new generation if written to
+        if self._mmap_path is not None:
+            self._mmap_path = index_path
+        
+        # The old generation is unreachable now
+        for name in previous:
+            (self.store_path / name).unlink(missing_ok=True)
+        
         print(f"✅ Saved vector store to {self.store_path}")
     
-    def load(self):
-        """Load index and metadata from disk"""
-        index_path = self.store_path / "index.faiss"
-        metadata_path = self.store_path / "metadata.pkl"
+    @staticmethod
+    def _fsync(path: Path):
+        """Flush a file or directory to disk"""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def _read_manifest(self):
+        """(index file name, metadata file name) of the current generation, if any"""
+        manifest_path = self.store_path / MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+        manifest = json.loads(manifest_path.read_text())
+        return manifest['index'], manifest['metadata']
+    
+    def load(self, mmap: bool = True):
+        """
+        Load index and metadata from disk.
+        
+        Args:
+            mmap: Memory-map the stored vector codes so they are paged in
+                on demand instead of copied into RAM. Uses IO_FLAG_MMAP_IFC,
+                which covers the flat and scalar-quantized codes and the HNSW
+                storage built by create_index (plain IO_FLAG_MMAP only maps
+                IVF inverted lists). The mapped codes cannot grow or shrink,
+                so the first add_vectors() or delete() re-reads the index
+                into RAM; pass mmap=False to skip the mapping up front.
+        """
+        manifest = self._read_manifest()
+        if manifest is not None:
+            index_path = self.store_path / manifest[0]
+            metadata_path = self.store_path / manifest[1]
+        else:
+            # Stores written before generations were introduced
+            index_path = self.store_path / "index.faiss"
+            metadata_path = self.store_path / "metadata.arrow"
+        
+        # Stores written before the Arrow switch still carry a pickle
+        if not metadata_path.exists() and (self.store_path / "metadata.pkl").exists():
+            metadata_path = self.store_path / "metadata.pkl"
         
         if not index_path.exists() or not metadata_path.exists():
             print(f"❌ Vector store not found at {self.store_path}")
@@ -83,9 +396,22 @@ class FAISSVectorStore:
             return False
         
         try:
-            self.index = faiss.read_index(str(index_path))
-            with open(metadata_path, 'rb') as f:
-                self.metadata = pickle.load(f)
+            io_flags = faiss.IO_FLAG_MMAP_IFC if mmap else 0
+            self.index = faiss.read_index(str(index_path), io_flags)
+            self._mmap_path = index_path if mmap else None
+            self._l2_scores = self.index.metric_type == faiss.METRIC_L2
+            if self._l2_scores:
+                print("ℹ️ Legacy L2 index: distances are converted to cosine similarity")
+            self._maybe_to_gpu()
+            if metadata_path.suffix == '.arrow':
+                self._table = feather.read_table(str(metadata_path), memory_map=True)
+                self._schema = self._table.schema
+            else:
+                with open(metadata_path, 'rb') as f:
+                    self._table = None
+                    self._schema = None
+                    self._append_metadata(pickle.load(f))
+                self._flush_metadata()
             
             print(f"✅ Loaded vector store with {self.index.ntotal} vectors")
             return True
@@ -0,0 +1,8 @@
+import plotly.io as pio
+
+# Serialize figures with orjson's C encoder when it's installed
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
@@ -8,8 +8,242 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+import asyncio
+import atexit
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Optional, List, Dict
-from scipy.interpolate import griddata
+from scipy.interpolate import griddata, RegularGridInterpolator
+from scipy.ndimage import distance_transform_edt
+from scipy.spatial import Delaunay
+from scipy.stats import binned_statistic_2d
+
+# Below this many points triangulation caching isn't worth it
+MIN_POINTS_FOR_FAST_INTERP = 20
+MAX_CACHED_TRIANGULATIONS = 16
+MAX_PREPARED_FRAMES = 8
+
+# Above this many rows the T-S diagram is drawn from a binned grid
+TS_BIN_THRESHOLD = 20_000
+TS_BINS = 300
+
+# Above this many points spatial maps are binned before cubic interpolation
+SPATIAL_BIN_THRESHOLD = 5000
+SPATIAL_BINS = 25
+
+# Sections with few pressure levels, each well populated, are treated as gridded
+MAX_STANDARD_LEVELS = 100
+MIN_POINTS_PER_LEVEL = 5
+
+# Per-frame caches below treat input frames as immutable: a frame modified
+# in place after being plotted (same object, same length) gets stale results.
+# Pass a new frame (e.g. df.copy() or df.assign(...)) after editing one.
+
+# (id(df), len(df), time_col) -> (weakref to df, time-sorted copy)
+_prep_cache: Dict[tuple, tuple] = {}
+
+# (id(df), len(df)) -> (weakref to df, argsort of pressure, sorted pressure)
+_pressure_cache: Dict[tuple, tuple] = {}
+
+
+@lru_cache(maxsize=64)
+def _density_grid(sal_min: float, sal_max: float, temp_min: float, temp_max: float, n: int = 50):
+    """
+    Simplified density on an n x n salinity/temperature grid.
+    Cached on the (rounded) data ranges, which rarely change between calls.
+    """
+    sal_range = np.linspace(sal_min, sal_max, n)
+    temp_range = np.linspace(temp_min, temp_max, n)
+    sal_grid, temp_grid = np.meshgrid(sal_range, temp_range)
+    density_grid = _simplified_density(sal_grid, temp_grid).astype(np.float32, copy=False)
+    
+    # Shared between calls, so keep them immutable
+    for arr in (sal_range, temp_range, density_grid):
+        arr.setflags(write=False)
+    return sal_range, temp_range, density_grid
+
+
+def _binned_cubic_grid(
+    x: np.ndarray,
+    y: np.ndarray,
+    values: np.ndarray,
+    x_grid: np.ndarray,
+    y_grid: np.ndarray,
+    bins: int = SPATIAL_BINS
+) -> np.ndarray:
+    """
+    Smooth surface from many scattered points without triangulating them.
+    Points are averaged onto a bins x bins grid, empty cells take their
+    nearest neighbour, then a cubic RegularGridInterpolator fills x_grid/y_grid.
+    Output cells more than one bin away from any data are left as NaN,
+    similar to griddata's convex-hull masking.
+    """
+    binned, x_edges, y_edges, _ = binned_statistic_2d(x, y, values, statistic='mean', bins=bins)
+    dist, (ii, jj) = distance_transform_edt(np.isnan(binned), return_indices=True)
+    filled = binned[ii, jj]
+    
+    x_mid = 0.5 * (x_edges[:-1] + x_edges[1:])
+    y_mid = 0.5 * (y_edges[:-1] + y_edges[1:])
+    interp = RegularGridInterpolator((x_mid, y_mid), filled, method='cubic')
+    
+    # The outer half-bin border holds the edge values
+    points = np.column_stack([
+        np.clip(x_grid.ravel(), x_mid[0], x_mid[-1]),
+        np.clip(y_grid.ravel(), y_mid[0], y_mid[-1])
+    ])
+    grid = interp(points).reshape(x_grid.shape)
+    
+    ix = np.clip(np.searchsorted(x_edges, x_grid, side='right') - 1, 0, bins - 1)
+    iy = np.clip(np.searchsorted(y_edges, y_grid, side='right') - 1, 0, bins - 1)
+    grid[dist[ix, iy] > 1] = np.nan
+    return grid
+
+
+def _cache_entry_ref(cache: Dict[tuple, tuple], key: tuple, df: pd.DataFrame) -> weakref.ref:
+    """Weakref to df that drops cache[key] as soon as df is garbage-collected"""
+    def evict(ref):
+        entry = cache.get(key)
+        # Only remove the entry this ref belongs to
+        if entry is not None and entry[0] is ref:
+            del cache[key]
+    return weakref.ref(df, evict)
+
+
+def _prepared(df: pd.DataFrame, time_col: str = 'timestamp') -> pd.DataFrame:
+    """
+    Return df with time_col parsed to datetime and sorted by it.
+    Repeated plots of the same frame reuse the result (until the frame is
+    collected); the caller's frame is never modified.
+    """
+    key = (id(df), len(df), time_col)
+    cached = _prep_cache.get(key)
+    # The weakref guards against a new frame reusing a freed id
+    if cached is not None and cached[0]() is df:
+        return cached[1]
+    
+    times = df[time_col]
+    if not pd.api.types.is_datetime64_any_dtype(times):
+        times = pd.to_datetime(times)
+    result = df.assign(**{time_col: times}).sort_values(time_col)
+    
+    if len(_prep_cache) >= MAX_PREPARED_FRAMES:
+        _prep_cache.pop(next(iter(_prep_cache)))
+    _prep_cache[key] = (_cache_entry_ref(_prep_cache, key, df), result)
+    return result
+
+
+def _regular_section_grid(
+    distance: np.ndarray,
+    depth: np.ndarray,
+    values: np.ndarray,
+    xi: np.ndarray,
+    yi: np.ndarray
+) -> Optional[np.ndarray]:
+    """
+    Interpolate a section that sits on standard pressure levels without
+    triangulating. Returns None when the data isn't a complete regular grid.
+    """
+    levels, counts = np.unique(depth, return_counts=True)
+    if len(levels) < 2 or len(levels) >= MAX_STANDARD_LEVELS or counts.min() <= MIN_POINTS_PER_LEVEL:
+        return None
+    
+    grid = (
+        pd.DataFrame({'pressure': depth, 'distance': distance, 'value': values})
+        .groupby(['pressure', 'distance'], sort=True)['value']
+        .mean()
+        .unstack('distance')
+    )
+    # Holes in the matrix would spread NaNs; leave those to the scattered path
+    if grid.shape[1] < 2 or grid.isna().to_numpy().any():
+        return None
+    
+    interp = RegularGridInterpolator(
+        (grid.index.to_numpy(dtype=float), grid.columns.to_numpy(dtype=float)),
+        grid.to_numpy(dtype=float),
+        bounds_error=False
+    )
+    return interp(np.stack([yi.ravel(), xi.ravel()], axis=-1)).reshape(xi.shape)
+
+
+@lru_cache(maxsize=1)
+def _get_pool() -> ProcessPoolExecutor:
+    """
+    Shared worker pool for CPU-heavy plots; workers start on first submit.
+    Workers come from a forkserver rather than fork(), which is unsafe from a
+    multi-threaded server (Streamlit threads, BLAS/torch pools).
+    """
+    pool = ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context('forkserver')
+    )
+    # Don't let workers outlive the server process or a module reload
+    atexit.register(pool.shutdown, wait=False, cancel_futures=True)
+    return pool
+
+
+def _section_worker(df: pd.DataFrame, parameter: str, title: Optional[str]) -> go.Figure:
+    """Top-level so it pickles; each worker reuses its own singleton's caches"""
+    return advanced_plots.create_section_plot(df, parameter, title)
+
+
+def _depth_slice(df: pd.DataFrame, depth_level: float, tolerance: float = 5.0) -> pd.DataFrame:
+    """
+    Rows with |pressure - depth_level| < tolerance.
+    The pressure sort is computed once per frame, so each further depth
+    level is a binary search instead of a full scan.
+    """
+    key = (id(df), len(df))
+    cached = _pressure_cache.get(key)
+    if cached is None or cached[0]() is not df:
+        pressure = df['pressure'].to_numpy(dtype=float)
+        order = np.argsort(pressure, kind='stable')
+        if len(_pressure_cache) >= MAX_PREPARED_FRAMES:
+            _pressure_cache.pop(next(iter(_pressure_cache)))
+        cached = (_cache_entry_ref(_pressure_cache, key, df), order, pressure[order])
+        _pressure_cache[key] = cached
+    
+    _, order, p_sorted = cached
+    lo = np.searchsorted(p_sorted, depth_level - tolerance, side='right')
+    hi = np.searchsorted(p_sorted, depth_level + tolerance, side='left')
+    # Keep the original row order
+    return df.iloc[np.sort(order[lo:hi])]
+
+
+def _simplified_density(salinity: np.ndarray, temperature: np.ndarray) -> np.ndarray:
+    """
+    Simplified potential density, 1000 + 0.7*S - 0.2*T.
+    For production, use gsw (Gibbs SeaWater) library
+    """
+    salinity = np.asarray(salinity, dtype=np.float64)
+    temperature = np.asarray(temperature, dtype=np.float64)
+    
+    # In-place ufuncs: one temporary instead of three
+    out = np.multiply(salinity, 0.7)
+    out += 1000.0
+    out -= np.multiply(temperature, 0.2)
+    return out
+
+
+def _linear_interp(tri: Delaunay, values: np.ndarray, xi: np.ndarray, yi: np.ndarray) -> np.ndarray:
+    """
+    Linear interpolation on a prebuilt triangulation.
+    Same result as griddata(method='linear'): NaN outside the convex hull.
+    """
+    points = np.column_stack([xi.ravel(), yi.ravel()]).astype(np.float64)
+    simplex_ids = tri.find_simplex(points)
+    values = np.asarray(values, dtype=np.float64)
+    
+    # Barycentric weights of every grid point in its simplex, vectorized
+    transform = tri.transform[simplex_ids]
+    bary = np.einsum('ijk,ik->ij', transform[:, :2], points - transform[:, 2])
+    bary = np.column_stack([bary, 1.0 - bary.sum(axis=1)])
+    out = (values[tri.simplices[simplex_ids]] * bary).sum(axis=1)
+    out[simplex_ids < 0] = np.nan
+    
+    return out.reshape(xi.shape)
 
 
 class AdvancedOceanPlots:
@@ -24,6 +258,40 @@ class AdvancedOceanPlots:
             'oxygen': 'Blues',
             'chlorophyll': 'Greens'
         }
+        # Delaunay triangulations keyed by the coordinates they were built on
+        self._tri_cache: Dict[tuple, Delaunay] = {}
+        # Static layout per plot type as plain dicts; go.Figure copies them on construction
+        self._layouts = self._build_layouts()
+    
+    def _build_layouts(self) -> Dict[str, dict]:
+        """Layouts shared by every figure of a given kind"""
+        depth_axis = dict(title='Pressure (dbar)', autorange='reversed')
+        # Zero line for anomalies, the shape add_vline would produce
+        zero_line = dict(
+            type='line', x0=0, x1=0, xref='x', y0=0, y1=1, yref='y domain',
+            line=dict(dash='dash', color='gray')
+        )
+        return {
+            'section': dict(height=500, hovermode='closest', yaxis=depth_axis),
+            'hovmoller': dict(height=500, yaxis=depth_axis, xaxis=dict(title='Time')),
+            'depth_histogram': dict(height=500, yaxis=depth_axis),
+            'anomaly': dict(height=600, yaxis=depth_axis, shapes=[zero_line]),
+        }
+    
+    def _from_template(self, kind: str) -> go.Figure:
+        """Fresh figure carrying the prebuilt layout for this plot type"""
+        return go.Figure(layout=self._layouts[kind])
+    
+    def _get_triangulation(self, points: np.ndarray) -> Delaunay:
+        """Triangulate points, reusing the result for repeated sections"""
+        key = (points.shape, hash(points.tobytes()))
+        tri = self._tri_cache.get(key)
+        if tri is None:
+            tri = Delaunay(points)
+            if len(self._tri_cache) >= MAX_CACHED_TRIANGULATIONS:
+                self._tri_cache.pop(next(iter(self._tri_cache)))
+            self._tri_cache[key] = tri
+        return tri
     
     def create_section_plot(
         self,
@@ -57,36 +325,65 @@ class AdvancedOceanPlots:
         yi = np.linspace(depth.min(), depth.max(), 100)
         xi, yi = np.meshgrid(xi, yi)
         
-        # Interpolate
-        zi = griddata((distance, depth), values, (xi, yi), method='linear')
-        
-        # Create contour plot
-        fig = go.Figure(data=go.Contour(
+        # Interpolate; standard pressure levels need no triangulation
+        zi = _regular_section_grid(distance, depth, values, xi, yi)
+        if zi is None:
+            if len(values) < MIN_POINTS_FOR_FAST_INTERP:
+                zi = griddata((distance, depth), values, (xi, yi), method='linear')
+            else:
+                points = np.column_stack([distance, depth]).astype(np.float64)
+                zi = _linear_interp(self._get_triangulation(points), values, xi, yi)
+        
+        # float32 is plenty for display and halves the figure payload
+        zi = zi.astype(np.float32, copy=False)
+        
+        # Smoothed heatmap for the fill (fast image path), labelled
+        # iso-lines drawn on top without a fill of their own
+        fig = self._from_template('section')
+        fig.add_trace(go.Heatmap(
             x=xi[0],
             y=yi[:, 0],
             z=zi,
+            zsmooth='best',
             colorscale=self.color_scales.get(parameter, 'Viridis'),
-            colorbar=dict(title=parameter.capitalize()),
+            colorbar=dict(title=parameter.capitalize())
+        ))
+        fig.add_trace(go.Contour(
+            x=xi[0],
+            y=yi[:, 0],
+            z=zi,
+            showscale=False,
+            hoverinfo='skip',
+            line_width=1,
             contours=dict(
+                coloring='none',
                 showlabels=True,
                 labelfont=dict(size=10, color='white')
             )
         ))
         
-        fig.update_yaxes(
-            title='Pressure (dbar)',
-            autorange='reversed'
-        )
-        fig.update_xaxes(title=x_label)
-        
         fig.update_layout(
             title=title or f"{parameter.capitalize()} Section",
-            height=500,
-            hovermode='closest'
+            xaxis_title=x_label
         )
         
         return fig
     
+    async def create_section_plot_async(
+        self,
+        df: pd.DataFrame,
+        parameter: str = 'temperature',
+        title: str = None
+    ) -> go.Figure:
+        """
+        create_section_plot in a worker process, so the interpolation
+        doesn't block the event loop or hold the GIL
+        """
+        # Only ship the columns the section needs across the process boundary
+        cols = [col for col in ('latitude', 'longitude', 'pressure', parameter) if col in df.columns]
+        future = _get_pool().submit(_section_worker, df[cols], parameter, title)
+        return await asyncio.wrap_future(future)
+    
     def create_hovmoller_diagram(
         self,
         df: pd.DataFrame,
@@ -101,35 +398,25 @@ class AdvancedOceanPlots:
         if df.empty or 'timestamp' not in df.columns or 'pressure' not in df.columns:
             return self._empty_figure(title or "Hovmöller Diagram")
         
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.sort_values('timestamp')
+        df = _prepared(df, 'timestamp')
         
-        # Pivot for heatmap
-        pivot = df.pivot_table(
-            values=parameter,
-            index='pressure',
-            columns='timestamp',
-            aggfunc='mean'
+        # Pivot for heatmap (groupby+unstack skips pivot_table's extra reshaping)
+        pivot = (
+            df.groupby(['pressure', 'timestamp'], sort=True, observed=True)[parameter]
+            .mean()
+            .unstack('timestamp')
         )
         
-        fig = go.Figure(data=go.Heatmap(
+        fig = self._from_template('hovmoller')
+        fig.add_trace(go.Heatmap(
             x=pivot.columns,
             y=pivot.index,
-            z=pivot.values,
+            z=pivot.values.astype(np.float32, copy=False),
             colorscale=self.color_scales.get(parameter, 'Viridis'),
             colorbar=dict(title=parameter.capitalize())
         ))
         
-        fig.update_yaxes(
-            title='Pressure (dbar)',
-            autorange='reversed'
-        )
-        fig.update_xaxes(title='Time')
-        
-        fig.update_layout(
-            title=title or f"{parameter.capitalize()} Hovmöller Diagram",
-            height=500
-        )
+        fig.update_layout(title=title or f"{parameter.capitalize()} Hovmöller Diagram")
         
         return fig
     
@@ -146,30 +433,32 @@ class AdvancedOceanPlots:
         if df.empty or 'temperature' not in df.columns or 'salinity' not in df.columns:
             return self._empty_figure(title)
         
-        # Calculate potential density (simplified)
-        # For production, use gsw (Gibbs SeaWater) library
-        df['density'] = 1000 + 0.7 * df['salinity'] - 0.2 * df['temperature']
-        
-        # Create scatter plot
-        fig = px.scatter(
-            df,
-            x='salinity',
-            y='temperature',
-            color='pressure',
-            color_continuous_scale='Viridis_r',
-            labels={
-                'salinity': 'Salinity (PSU)',
-                'temperature': 'Temperature (°C)',
-                'pressure': 'Pressure (dbar)'
-            },
-            title=title
-        )
+        if len(df) > TS_BIN_THRESHOLD:
+            # Mean pressure per T-S bin: bounded number of marks for the browser
+            fig = self._binned_ts_figure(df, title)
+        else:
+            # Create scatter plot
+            fig = px.scatter(
+                df,
+                x='salinity',
+                y='temperature',
+                color='pressure',
+                color_continuous_scale='Viridis_r',
+                labels={
+                    'salinity': 'Salinity (PSU)',
+                    'temperature': 'Temperature (°C)',
+                    'pressure': 'Pressure (dbar)'
+                },
+                title=title
+            )
         
         # Add density contours
-        sal_range = np.linspace(df['salinity'].min(), df['salinity'].max(), 50)
-        temp_range = np.linspace(df['temperature'].min(), df['temperature'].max(), 50)
-        sal_grid, temp_grid = np.meshgrid(sal_range, temp_range)
-        density_grid = 1000 + 0.7 * sal_grid - 0.2 * temp_grid
+        sal_range, temp_range, density_grid = _density_grid(
+            round(float(df['salinity'].min()), 2),
+            round(float(df['salinity'].max()), 2),
+            round(float(df['temperature'].min()), 2),
+            round(float(df['temperature'].max()), 2)
+        )
         
         fig.add_trace(go.Contour(
             x=sal_range,
@@ -189,6 +478,33 @@ class AdvancedOceanPlots:
         
         return fig
     
+    def _binned_ts_figure(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """T-S heatmap of mean pressure on a TS_BINS x TS_BINS grid"""
+        valid = df[['salinity', 'temperature', 'pressure']].dropna()
+        mean_pressure, sal_edges, temp_edges, _ = binned_statistic_2d(
+            valid['salinity'],
+            valid['temperature'],
+            valid['pressure'],
+            statistic='mean',
+            bins=TS_BINS
+        )
+        
+        fig = go.Figure(go.Heatmap(
+            x=0.5 * (sal_edges[:-1] + sal_edges[1:]),
+            y=0.5 * (temp_edges[:-1] + temp_edges[1:]),
+            # binned_statistic_2d is indexed [salinity, temperature]
+            z=mean_pressure.T.astype(np.float32),
+            colorscale='Viridis_r',
+            colorbar=dict(title='Pressure (dbar)'),
+            hovertemplate='Salinity: %{x:.2f} PSU<br>Temp: %{y:.2f}°C<br>Mean pressure: %{z:.0f} dbar<extra></extra>'
+        ))
+        fig.update_layout(
+            title=title,
+            xaxis_title='Salinity (PSU)',
+            yaxis_title='Temperature (°C)'
+        )
+        return fig
+    
     def create_property_property_plot(
         self,
         df: pd.DataFrame,
@@ -245,29 +561,80 @@ class AdvancedOceanPlots:
             shared_yaxes=True
         )
         
-        groups = df.groupby(group_by)
         colors = px.colors.qualitative.Set1
         
+        # Categorical groups sort and split on integer codes, not Python objects
+        groups = df[group_by].astype('category').cat.remove_unused_categories()
+        df = df.assign(**{group_by: groups})
+        
+        # Sort once so every group is a contiguous, pressure-ordered block
+        df = df.sort_values([group_by, 'pressure'])
+        codes = df[group_by].cat.codes.to_numpy()
+        group_names = df[group_by].cat.categories
+        valid = codes >= 0
+        df, codes = df[valid], codes[valid]
+        labels = group_names.astype(str).to_numpy(dtype=object)
+        pressure = df['pressure'].to_numpy(dtype=float)
+        
+        # Groups sharing a palette colour go into one NaN-separated WebGL
+        # trace: at most len(colors) traces per panel however many groups
+        n_groups = len(group_names)
+        batched = n_groups > len(colors)
+        color_idx = codes % len(colors)
+        
         for i, param in enumerate(parameters, 1):
             if param not in df.columns:
                 continue
             
-            for j, (name, group) in enumerate(groups):
-                group = group.sort_values('pressure')
+            values = df[param].to_numpy(dtype=float)
+            
+            for c in range(min(n_groups, len(colors))):
+                mask = color_idx == c
+                trace_codes = codes[mask]
+                breaks = np.flatnonzero(trace_codes[1:] != trace_codes[:-1]) + 1
                 
                 fig.add_trace(
-                    go.Scatter(
-                        x=group[param],
-                        y=group['pressure'],
+                    go.Scattergl(
+                        x=np.insert(values[mask], breaks, np.nan),
+                        y=np.insert(pressure[mask], breaks, np.nan),
+                        customdata=np.insert(labels[trace_codes], breaks, ''),
                         mode='lines',
-                        name=str(name),
-                        line=dict(color=colors[j % len(colors)]),
-                        showlegend=(i == 1)  # Only show legend for first subplot
+                        connectgaps=False,
+                        name=str(group_names[c]),
+                        legendgroup=str(c),
+                        line=dict(color=colors[c]),
+                        # Only show legend for first subplot, and only when
+                        # each trace is a single group (see below otherwise)
+                        showlegend=(i == 1 and not batched),
+                        hovertemplate=(
+                            f'{group_by}: %{{customdata}}<br>'
+                            f'{param.capitalize()}: %{{x:.2f}}<br>'
+                            'Depth: %{y:.1f}<extra></extra>'
+                        )
                     ),
                     row=1,
                     col=i
                 )
         
+        if batched:
+            # Batched traces hold several groups each, so every group gets an
+            # empty legend-only trace; clicking it toggles its colour's batch
+            for code, label in enumerate(labels):
+                c = code % len(colors)
+                fig.add_trace(
+                    go.Scattergl(
+                        x=[None],
+                        y=[None],
+                        mode='lines',
+                        name=label,
+                        legendgroup=str(c),
+                        line=dict(color=colors[c]),
+                        hoverinfo='skip'
+                    ),
+                    row=1,
+                    col=1
+                )
+        
         fig.update_yaxes(title_text='Pressure (dbar)', autorange='reversed', row=1, col=1)
         
         for i, param in enumerate(parameters, 1):
@@ -295,26 +662,28 @@ class AdvancedOceanPlots:
         if df.empty or parameter not in df.columns or 'pressure' not in df.columns:
             return self._empty_figure(title or "Depth Histogram")
         
-        # Create depth bins
-        df['depth_bin'] = pd.cut(df['pressure'], bins=depth_bins)
-        
-        fig = go.Figure()
+        # Count values per (depth bin, value bin) server-side: one trace,
+        # no client-side re-binning
+        valid = df[['pressure', parameter]].dropna()
+        counts, pressure_edges, value_edges = np.histogram2d(
+            valid['pressure'].to_numpy(),
+            valid[parameter].to_numpy(),
+            bins=[depth_bins, 50]
+        )
         
-        for depth_bin in sorted(df['depth_bin'].unique()):
-            data = df[df['depth_bin'] == depth_bin][parameter]
-            
-            fig.add_trace(go.Histogram(
-                x=data,
-                name=str(depth_bin),
-                opacity=0.7
-            ))
+        fig = self._from_template('depth_histogram')
+        fig.add_trace(go.Heatmap(
+            x=0.5 * (value_edges[:-1] + value_edges[1:]),
+            y=0.5 * (pressure_edges[:-1] + pressure_edges[1:]),
+            z=counts,
+            colorscale='Viridis',
+            colorbar=dict(title='Count'),
+            hovertemplate=f'{parameter.capitalize()}: %{{x:.2f}}<br>Depth: %{{y:.0f}} dbar<br>Count: %{{z}}<extra></extra>'
+        ))
         
         fig.update_layout(
-            barmode='overlay',
             title=title or f"{parameter.capitalize()} Distribution by Depth",
-            xaxis_title=parameter.capitalize(),
-            yaxis_title='Count',
-            height=500
+            xaxis_title=parameter.capitalize()
         )
         
         return fig
@@ -334,7 +703,7 @@ class AdvancedOceanPlots:
             return self._empty_figure(title or "Spatial Interpolation")
         
         # Filter by depth
-        depth_data = df[abs(df['pressure'] - depth_level) < 5]
+        depth_data = _depth_slice(df, depth_level)
         
         if depth_data.empty:
             return self._empty_figure(title or f"No data at {depth_level}m depth")
@@ -349,20 +718,35 @@ class AdvancedOceanPlots:
         lon_grid = np.linspace(lon.min(), lon.max(), 50)
         lon_grid, lat_grid = np.meshgrid(lon_grid, lat_grid)
         
-        values_grid = griddata(
-            (lon, lat),
-            values,
-            (lon_grid, lat_grid),
-            method='cubic'
-        )
+        if len(values) > SPATIAL_BIN_THRESHOLD:
+            # Clough-Tocher over thousands of points is the slow path
+            valid = ~np.isnan(values)
+            values_grid = _binned_cubic_grid(lon[valid], lat[valid], values[valid], lon_grid, lat_grid)
+        else:
+            values_grid = griddata(
+                (lon, lat),
+                values,
+                (lon_grid, lat_grid),
+                method='cubic'
+            )
+        values_grid = values_grid.astype(np.float32, copy=False)
         
-        fig = go.Figure(data=go.Contour(
+        fig = go.Figure(data=go.Heatmap(
             x=lon_grid[0],
             y=lat_grid[:, 0],
             z=values_grid,
+            zsmooth='best',
             colorscale=self.color_scales.get(parameter, 'Viridis'),
-            colorbar=dict(title=parameter.capitalize()),
-            contours=dict(showlabels=True)
+            colorbar=dict(title=parameter.capitalize())
+        ))
+        fig.add_trace(go.Contour(
+            x=lon_grid[0],
+            y=lat_grid[:, 0],
+            z=values_grid,
+            showscale=False,
+            hoverinfo='skip',
+            line_width=1,
+            contours=dict(coloring='none', showlabels=True)
         ))
         
         # Add measurement points
@@ -397,31 +781,41 @@ class AdvancedOceanPlots:
         if df.empty or parameter not in df.columns or 'pressure' not in df.columns:
             return self._empty_figure(title or "Anomaly Plot")
         
+        # Narrow working frame of freshly allocated C-contiguous columns,
+        # instead of a full df.copy()
+        cols = ['pressure', parameter] + (['timestamp'] if 'timestamp' in df.columns else [])
+        df = pd.DataFrame({col: np.ascontiguousarray(df[col].to_numpy()) for col in cols})
+        
         # Calculate baseline
         if baseline == 'mean':
-            baseline_values = df.groupby('pressure')[parameter].mean()
+            baseline_values = df.groupby('pressure', sort=False, observed=True)[parameter].mean()
         elif baseline == 'median':
-            baseline_values = df.groupby('pressure')[parameter].median()
+            baseline_values = df.groupby('pressure', sort=False, observed=True)[parameter].median()
         else:
             return self._empty_figure("Invalid baseline")
         
         # Calculate anomalies
-        df = df.copy()
         df['baseline'] = df['pressure'].map(baseline_values)
         df['anomaly'] = df[parameter] - df['baseline']
         
-        fig = go.Figure()
+        fig = self._from_template('anomaly')
         
         # Plot profiles colored by anomaly
         if 'timestamp' in df.columns:
-            for timestamp, group in df.groupby('timestamp'):
-                fig.add_trace(go.Scatter(
-                    x=group['anomaly'],
-                    y=group['pressure'],
-                    mode='lines',
-                    name=str(timestamp),
-                    hovertemplate='Anomaly: %{x:.2f}<br>Depth: %{y:.0f}m'
-                ))
+            # One WebGL trace for all profiles; NaN rows break the line between them
+            df = df.sort_values(['timestamp', 'pressure'])
+            timestamps = df['timestamp'].to_numpy()
+            breaks = np.flatnonzero(timestamps[1:] != timestamps[:-1]) + 1
+            
+            fig.add_trace(go.Scattergl(
+                x=np.insert(df['anomaly'].to_numpy(dtype=float), breaks, np.nan),
+                y=np.insert(df['pressure'].to_numpy(dtype=float), breaks, np.nan),
+                customdata=np.insert(df['timestamp'].astype(str).to_numpy(dtype=object), breaks, ''),
+                mode='lines',
+                connectgaps=False,
+                showlegend=False,
+                hovertemplate='Anomaly: %{x:.2f}<br>Depth: %{y:.0f}m<br>%{customdata}<extra></extra>'
+            ))
         else:
             fig.add_trace(go.Scatter(
                 x=df['anomaly'],
@@ -434,15 +828,9 @@ class AdvancedOceanPlots:
                 )
             ))
         
-        # Add zero line
-        fig.add_vline(x=0, line_dash="dash", line_color="gray")
-        
-        fig.update_yaxes(title='Pressure (dbar)', autorange='reversed')
-        fig.update_xaxes(title=f'{parameter.capitalize()} Anomaly')
-        
         fig.update_layout(
             title=title or f"{parameter.capitalize()} Anomaly from {baseline.capitalize()}",
-            height=600
+            xaxis_title=f'{parameter.capitalize()} Anomaly'
         )
         
         return fig
@@ -0,0 +1,51 @@
+"""
+Figure cache for plot builders
+Identical calls on identical data return a copy of the stored figure
+"""
+
+import hashlib
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable
+
+import plotly.graph_objects as go
+import pandas as pd
+
+MAX_CACHED_FIGURES = 32
+
+_figures: "OrderedDict[tuple, dict]" = OrderedDict()
+
+
+def fingerprint(df: pd.DataFrame) -> tuple:
+    """
+    Stable identity for a DataFrame's contents: columns, dtypes and a digest
+    of the per-row hashes in order, so frames whose values, types or row
+    order differ (paths are drawn in row order) never collide
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    rows = hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+    return (len(df), tuple(df.columns), tuple(df.dtypes.astype(str)), rows)
+
+
+def cached_figure(func: Callable) -> Callable:
+    """
+    Memoize a `method(self, df, *args, **kwargs) -> go.Figure`.
+    Figures are stored as dicts so every hit hands out an independent copy;
+    they were validated when first built, so hits skip re-validation.
+    """
+    @wraps(func)
+    def wrapper(self, df: pd.DataFrame, *args, **kwargs) -> go.Figure:
+        key = (func.__qualname__, fingerprint(df), repr(args), repr(sorted(kwargs.items())))
+        
+        stored = _figures.get(key)
+        if stored is not None:
+            _figures.move_to_end(key)
+            return go.Figure(stored, _validate=False)
+        
+        fig = func(self, df, *args, **kwargs)
+        _figures[key] = fig.to_dict()
+        if len(_figures) > MAX_CACHED_FIGURES:
+            _figures.popitem(last=False)
+        return fig
+    
+    return wrapper
@@ -1,8 +1,28 @@
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
+import numpy as np
 from typing import Optional, List
 
+from visualization.figure_cache import cached_figure
+
+# Columns worth showing on hover; anything else is left out of the figure JSON
+HOVER_COLUMNS = ['float_id', 'cycle_number', 'pressure', 'temperature', 'salinity', 'dissolved_oxygen']
+
+# Above this many rows, map points are subsampled before being handed to Plotly
+MAX_MAP_ROWS = 100_000
+
+# Scatter maps with more points than this are merged into grid cells
+MAX_MAP_MARKERS = 8000
+
+# Identifiers are carried through aggregation, never averaged
+ID_COLUMNS = ('id', 'float_id', 'cycle_number')
+
+# Above this many points the density map is pre-binned on the server
+# into cells of DENSITY_CELL_DEG degrees
+DENSITY_BIN_THRESHOLD = 50_000
+DENSITY_CELL_DEG = 0.5
+
 class MapVisualizer:
     """
     Create interactive geographic visualizations.
@@ -11,7 +31,14 @@ class MapVisualizer:
     
     def __init__(self):
         self.default_mapbox_style = "open-street-map"
+        # Layout shared by the point maps, as a plain dict go.Figure copies on construction
+        self._map_layout = dict(
+            mapbox_style=self.default_mapbox_style,
+            height=600,
+            margin={"r": 0, "t": 40, "l": 0, "b": 0}
+        )
     
+    @cached_figure
     def create_float_trajectory_map(
         self,
         df: pd.DataFrame,
@@ -32,12 +59,14 @@ class MapVisualizer:
         if df.empty:
             return self._create_empty_map(title)
         
+        df = self._downsample(df)
+        
         # Check if color_by column exists, if not use default or first available numeric column
         if color_by not in df.columns:
             # Try to find a suitable numeric column
             numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns.tolist()
             # Remove lat/lon from options
-            numeric_cols = [col for col in numeric_cols if col not in ['latitude', 'longitude', 'id']]
+            numeric_cols = [col for col in numeric_cols if col not in ['latitude', 'longitude', 'id', 'n_points']]
             
             if numeric_cols:
                 color_by = numeric_cols[0]
@@ -51,13 +80,14 @@ class MapVisualizer:
             'longitude': ':.2f'
         }
         
-        # Add color_by column to hover_data if it's numeric
-        if color_by in df.columns and pd.api.types.is_numeric_dtype(df[color_by]):
+        # Numbers get a colour scale; anything else is coloured by category
+        if pd.api.types.is_numeric_dtype(df[color_by]):
             hover_data[color_by] = ':.2f'
+        else:
+            hover_data[color_by] = True
         
         # Add other commonly useful columns if they exist
-        optional_cols = ['float_id', 'cycle_number', 'pressure', 'salinity', 'dissolved_oxygen']
-        for col in optional_cols:
+        for col in HOVER_COLUMNS:
             if col in df.columns and col != color_by:
                 if pd.api.types.is_numeric_dtype(df[col]):
                     hover_data[col] = ':.2f'
@@ -66,28 +96,9 @@ class MapVisualizer:
         if 'timestamp' in df.columns and 'timestamp' != color_by:
             hover_data['timestamp'] = True
         
-        # Create scatter mapbox
-        fig = px.scatter_mapbox(
-            df,
-            lat='latitude',
-            lon='longitude',
-            color=color_by,
-            size=[10] * len(df),  # Fixed size for visibility
-            hover_data=hover_data,
-            color_continuous_scale='Viridis',
-            title=title,
-            zoom=3
-        )
-        
-        # Update layout
-        fig.update_layout(
-            mapbox_style=self.default_mapbox_style,
-            height=600,
-            margin={"r": 0, "t": 40, "l": 0, "b": 0}
-        )
-        
-        return fig
+        return self._scatter_map(df, hover_data, title, color_by)
     
+    @cached_figure
     def create_density_heatmap(
         self,
         df: pd.DataFrame,
@@ -100,9 +111,22 @@ class MapVisualizer:
         if df.empty:
             return self._create_empty_map(title)
         
+        lat = df['latitude'].to_numpy(dtype=float)
+        lon = df['longitude'].to_numpy(dtype=float)
+        weights = None
+        
+        # Map centre from the arrays already in hand (NaN-skipping, like Series.mean)
+        center_lat, center_lon = np.nanmean(lat), np.nanmean(lon)
+        
+        if len(df) > DENSITY_BIN_THRESHOLD:
+            # Ship one weighted point per occupied cell instead of every
+            # measurement, so the browser's kernel density stays cheap
+            lat, lon, weights = self._grid_counts(lat, lon)
+        
         fig = go.Figure(go.Densitymapbox(
-            lat=df['latitude'],
-            lon=df['longitude'],
+            lat=lat,
+            lon=lon,
+            z=weights,
             radius=20,
             colorscale='Hot',
             showscale=True,
@@ -113,8 +137,8 @@ class MapVisualizer:
             mapbox_style=self.default_mapbox_style,
             mapbox=dict(
                 center=dict(
-                    lat=df['latitude'].mean(),
-                    lon=df['longitude'].mean()
+                    lat=center_lat,
+                    lon=center_lon
                 ),
                 zoom=3
             ),
@@ -125,6 +149,7 @@ class MapVisualizer:
         
         return fig
     
+    @cached_figure
     def create_time_animated_map(
         self,
         df: pd.DataFrame,
@@ -138,27 +163,19 @@ class MapVisualizer:
         if df.empty or time_column not in df.columns:
             return self._create_empty_map(title)
         
-        # Convert timestamp to datetime
-        df[time_column] = pd.to_datetime(df[time_column])
-        df = df.sort_values(time_column)
-        
-        # Create time bins (monthly)
-        df['time_period'] = df[time_column].dt.to_period('M').astype(str)
-        
         # Find a suitable color column
         color_col = None
         if 'temperature' in df.columns:
             color_col = 'temperature'
         else:
             numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns.tolist()
-            numeric_cols = [col for col in numeric_cols if col not in ['latitude', 'longitude', 'id']]
+            numeric_cols = [col for col in numeric_cols if col not in ['latitude', 'longitude', 'id', 'n_points']]
             if numeric_cols:
                 color_col = numeric_cols[0]
         
         # Build hover_data with available columns
         hover_data = {'latitude': ':.2f', 'longitude': ':.2f'}
-        optional_cols = ['temperature', 'salinity', 'pressure', 'float_id', 'cycle_number', 'dissolved_oxygen']
-        for col in optional_cols:
+        for col in HOVER_COLUMNS:
             if col in df.columns:
                 if pd.api.types.is_numeric_dtype(df[col]):
                     hover_data[col] = ':.2f'
@@ -167,6 +184,24 @@ class MapVisualizer:
         if 'timestamp' in df.columns:
             hover_data['timestamp'] = True
         
+        # Work on a narrow view of just the columns the map uses, so the
+        # sort and aggregation below never touch (or copy) the rest
+        used = ['latitude', 'longitude', time_column, color_col, *hover_data]
+        df = df[list(dict.fromkeys(col for col in used if col))]
+        
+        # Convert timestamp to datetime (only if needed), without touching the caller's frame
+        times = df[time_column]
+        if not pd.api.types.is_datetime64_any_dtype(times):
+            times = pd.to_datetime(times)
+        
+        # Create time bins (monthly)
+        df = df.assign(**{time_column: times, 'time_period': self._month_labels(times)})
+        df = df.sort_values(time_column)
+        
+        # Cap the markers drawn in each animation frame
+        df = self._downsample(df, by='time_period')
+        df = self._project(df, hover_data, 'time_period', color_col)
+        
         # Create map
         if color_col:
             fig = px.scatter_mapbox(
@@ -175,7 +210,6 @@ class MapVisualizer:
                 lon='longitude',
                 animation_frame='time_period',
                 color=color_col,
-                size=[10] * len(df),
                 hover_data=hover_data,
                 color_continuous_scale='RdYlBu_r',
                 title=title,
@@ -188,12 +222,17 @@ class MapVisualizer:
                 lat='latitude',
                 lon='longitude',
                 animation_frame='time_period',
-                size=[10] * len(df),
                 hover_data=hover_data,
                 title=title,
                 zoom=3
             )
         
+        # Fixed marker size, set once per trace and per animation frame
+        fig.update_traces(marker=dict(size=10))
+        for frame in fig.frames:
+            for trace in frame.data:
+                trace.marker.size = 10
+        
         fig.update_layout(
             mapbox_style=self.default_mapbox_style,
             height=600,
@@ -214,49 +253,195 @@ class MapVisualizer:
         }
         
         # Add other available columns, properly checking types
-        for col in df.columns:
-            if col not in ['latitude', 'longitude', 'id']:
+        for col in HOVER_COLUMNS:
+            if col in df.columns:
                 if pd.api.types.is_numeric_dtype(df[col]):
                     hover_data[col] = ':.2f'
-                elif col != 'timestamp':  # Don't format timestamp
+                else:
                     hover_data[col] = True
         
         # Add timestamp separately
         if 'timestamp' in df.columns:
             hover_data['timestamp'] = True
         
-        # Create scatter mapbox without color
-        fig = px.scatter_mapbox(
-            df,
-            lat='latitude',
-            lon='longitude',
-            size=[10] * len(df),
-            hover_data=hover_data,
-            title=title,
-            zoom=3
-        )
+        return self._scatter_map(df, hover_data, title)
+    
+    def _scatter_map(
+        self,
+        df: pd.DataFrame,
+        hover_data: dict,
+        title: str,
+        color_by: Optional[str] = None
+    ) -> go.Figure:
+        """
+        Point map built straight from numpy arrays on the shared layout,
+        skipping plotly express's DataFrame introspection.
+        hover_data follows px conventions (':.2f' for numbers, True for raw).
+        """
+        df = self._project(df, hover_data, color_by)
+        lat = df['latitude'].to_numpy(dtype=float)
+        lon = df['longitude'].to_numpy(dtype=float)
+        
+        numeric = [col for col, fmt in hover_data.items() if fmt is not True and col not in ('latitude', 'longitude')]
+        raw = [col for col, fmt in hover_data.items() if fmt is True]
+        
+        # Numbers travel as one float32 block; everything else as a text line
+        lines = ['latitude=%{lat:.2f}', 'longitude=%{lon:.2f}']
+        lines += [f'{col}=%{{customdata[{i}]:.2f}}' for i, col in enumerate(numeric)]
+        text = None
+        if raw:
+            text = raw[0] + '=' + df[raw[0]].astype(str)
+            for col in raw[1:]:
+                text = text + '<br>' + col + '=' + df[col].astype(str)
+            lines.append('%{text}')
+        
+        customdata = df[numeric].to_numpy(dtype=np.float32) if numeric else None
+        text = text.to_numpy(dtype=object) if text is not None else None
+        hovertemplate = '<br>'.join(lines) + '<extra></extra>'
+        
+        fig = go.Figure(layout=self._map_layout)
+        
+        if color_by and not pd.api.types.is_numeric_dtype(df[color_by]):
+            # One trace per category with a legend entry, as plotly express draws it
+            codes, categories = pd.factorize(df[color_by], sort=True, use_na_sentinel=False)
+            palette = px.colors.qualitative.Plotly
+            for i, category in enumerate(categories):
+                rows = codes == i
+                fig.add_trace(go.Scattermapbox(
+                    lat=lat[rows],
+                    lon=lon[rows],
+                    mode='markers',
+                    name=str(category),
+                    marker=dict(size=10, color=palette[i % len(palette)]),
+                    customdata=customdata[rows] if customdata is not None else None,
+                    text=text[rows] if text is not None else None,
+                    hovertemplate=hovertemplate
+                ))
+            fig.update_layout(legend_title_text=color_by)
+        else:
+            marker = dict(size=10)
+            if color_by:
+                marker.update(
+                    color=df[color_by].to_numpy(dtype=np.float32),
+                    colorscale='Viridis',
+                    showscale=True,
+                    colorbar=dict(title=color_by)
+                )
+            fig.add_trace(go.Scattermapbox(
+                lat=lat,
+                lon=lon,
+                mode='markers',
+                marker=marker,
+                customdata=customdata,
+                text=text,
+                hovertemplate=hovertemplate
+            ))
         
-        # Update layout
         fig.update_layout(
-            mapbox_style=self.default_mapbox_style,
-            height=600,
-            margin={"r": 0, "t": 40, "l": 0, "b": 0}
+            title=title,
+            mapbox=dict(center=dict(lat=np.nanmean(lat), lon=np.nanmean(lon)), zoom=3)
         )
-        
         return fig
     
+    def _grid_counts(self, lat: np.ndarray, lon: np.ndarray, cell_deg: float = DENSITY_CELL_DEG):
+        """
+        Count points per fixed lat/lon cell.
+        Returns cell-centre latitudes, longitudes and counts for occupied
+        cells only, so the output size depends on coverage, not on N.
+        """
+        valid = ~(np.isnan(lat) | np.isnan(lon))
+        lat_idx = np.floor(lat[valid] / cell_deg).astype(np.int64)
+        lon_idx = np.floor(lon[valid] / cell_deg).astype(np.int64)
+        
+        # Pack both indices into one int64 key (offset keeps them non-negative)
+        offset, width = 2 ** 20, 2 ** 21
+        keys, counts = np.unique((lat_idx + offset) * width + (lon_idx + offset), return_counts=True)
+        
+        center_lat = (keys // width - offset + 0.5) * cell_deg
+        center_lon = (keys % width - offset + 0.5) * cell_deg
+        return center_lat, center_lon, counts
+    
+    def _month_labels(self, times: pd.Series) -> np.ndarray:
+        """
+        'YYYY-MM' label per timestamp, same as dt.to_period('M').astype(str)
+        but formatted once per distinct month instead of once per row
+        """
+        codes, months = pd.factorize(times.dt.year * 100 + times.dt.month)
+        labels = [f"{int(m) // 100:04d}-{int(m) % 100:02d}" for m in months]
+        # factorize marks NaT as -1, which picks the trailing 'NaT'
+        return np.array(labels + ['NaT'], dtype=object)[codes]
+    
+    def _downsample(
+        self,
+        df: pd.DataFrame,
+        max_points: int = MAX_MAP_MARKERS,
+        by: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Merge points into a lat/lon grid of roughly max_points cells
+        (per value of `by`, if given). Numeric columns are averaged, the rest
+        keep their first value, and n_points counts the merged rows.
+        """
+        if len(df) <= max_points:
+            return df
+        
+        df = df.dropna(subset=['latitude', 'longitude'])
+        lat = df['latitude'].to_numpy(dtype=float)
+        lon = df['longitude'].to_numpy(dtype=float)
+        
+        cells_per_side = int(np.sqrt(max_points))
+        step = max(np.ptp(lat), np.ptp(lon)) / cells_per_side or 1.0
+        lat_idx = np.floor((lat - lat.min()) / step).astype(np.int64)
+        lon_idx = np.floor((lon - lon.min()) / step).astype(np.int64)
+        cell = lat_idx * (cells_per_side + 1) + lon_idx
+        
+        keys = [cell] if by is None else [df[by].to_numpy(), cell]
+        agg = {
+            col: 'mean' if pd.api.types.is_numeric_dtype(df[col]) and col not in ID_COLUMNS else 'first'
+            for col in df.columns
+        }
+        # sort=False keeps first-appearance order, so time-sorted input stays sorted
+        grouped = df.groupby(keys, sort=False)
+        result = grouped.agg(agg).reset_index(drop=True)
+        result['n_points'] = grouped.size().to_numpy()
+        return result
+    
+    def _project(self, df: pd.DataFrame, hover_data: dict, *extra: Optional[str]) -> pd.DataFrame:
+        """
+        Keep only the columns a map references, subsampling very large frames.
+        Row order is preserved so time-sorted frames stay sorted.
+        """
+        # Aggregated frames say how many measurements each marker stands for
+        if 'n_points' in df.columns:
+            hover_data['n_points'] = True
+        
+        cols = list(dict.fromkeys(['latitude', 'longitude', *[c for c in extra if c], *hover_data]))
+        view = df[cols]
+        
+        if len(view) > MAX_MAP_ROWS:
+            rng = np.random.default_rng(0)
+            keep = np.sort(rng.choice(len(view), MAX_MAP_ROWS, replace=False))
+            view = view.iloc[keep]
+        
+        return view
+    
     def _create_hover_text(self, df: pd.DataFrame) -> List[str]:
         """Create informative hover text for each point"""
-        hover_texts = []
-        for _, row in df.iterrows():
-            text = f"Lat: {row['latitude']:.2f}°N<br>"
-            text += f"Lon: {row['longitude']:.2f}°E<br>"
-            if 'temperature' in row:
-                text += f"Temp: {row['temperature']:.2f}°C<br>"
-            if 'salinity' in row:
-                text += f"Salinity: {row['salinity']:.2f} PSU"
-            hover_texts.append(text)
-        return hover_texts
+        def fmt(col: str) -> pd.Series:
+            # Column-wise '%.2f' formatting instead of one f-string per row
+            return pd.Series(np.char.mod('%.2f', df[col].to_numpy(dtype=float)), index=df.index)
+        
+        def optional(col: str, label: str, unit: str) -> pd.Series:
+            # Rows missing the value get no line at all rather than 'nan'
+            if col not in df.columns:
+                return ''
+            parts = label + fmt(col) + unit
+            return pd.Series(np.where(df[col].notna(), parts, ''), index=df.index)
+        
+        text = 'Lat: ' + fmt('latitude') + '°N<br>Lon: ' + fmt('longitude') + '°E<br>'
+        text += optional('temperature', 'Temp: ', '°C<br>')
+        text += optional('salinity', 'Salinity: ', ' PSU')
+        return text.tolist()
     
     def _create_empty_map(self, title: str) -> go.Figure:
         """Create empty map with message"""
@@ -1,7 +1,74 @@
 import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
-from typing import List, Optional
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from visualization.figure_cache import cached_figure
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Up to this many profiles get their own trace and legend entry; beyond it
+# they share one NaN-separated trace
+MAX_PROFILE_TRACES = 50
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _run_offsets(keys):
+        """Start of every run of equal keys, plus len(keys) as the final end"""
+        n = keys.shape[0]
+        offsets = np.empty(n + 1, dtype=np.int64)
+        offsets[0] = 0
+        m = 1
+        for i in range(1, n):
+            if keys[i] != keys[i - 1]:
+                offsets[m] = i
+                m += 1
+        offsets[m] = n
+        return offsets[:m + 1]
+
+
+def _profile_offsets(keys: np.ndarray) -> np.ndarray:
+    """Ragged-array offsets: profile i spans rows offsets[i]:offsets[i + 1]"""
+    if len(keys) == 0:
+        return np.zeros(1, dtype=np.int64)
+    if HAS_NUMBA:
+        return _run_offsets(keys)
+    starts = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    return np.concatenate([[0], starts, [len(keys)]])
+
+
+def _ensure_categorical(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Profile keys as categoricals, so sorting and grouping work on integer
+    codes rather than hashing Python strings. A no-op when the caller already
+    passes categorical columns, which is the cheap path: convert once at load.
+    """
+    casts = {
+        col: 'category'
+        for col in ('float_id', 'cycle_number')
+        if col in df.columns and df[col].dtype == object
+    }
+    return df.astype(casts) if casts else df
+
+
+def _sort_profiles(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row order that sorts df by (float_id, cycle_number, pressure), and the
+    offsets of each (float_id, cycle_number) profile in that order.
+    Works on integer codes, so no pandas multi-column sort or groupby.
+    """
+    ids = df['float_id'].astype('category').cat.codes.to_numpy().astype(np.int64)
+    cycles = pd.factorize(df['cycle_number'], sort=True)[0].astype(np.int64)
+    pressure = df['pressure'].to_numpy(dtype=float, na_value=np.nan)
+    
+    order = np.lexsort((pressure, cycles, ids))
+    keys = ids[order] * (cycles.max(initial=0) + 1) + cycles[order]
+    return order, _profile_offsets(keys)
 
 class ProfilePlotter:
     """
@@ -9,6 +76,16 @@ class ProfilePlotter:
     Specialized plots for vertical temperature/salinity structure.
     """
     
+    def __init__(self):
+        # Temperature-vs-depth layout, as a plain dict go.Figure copies on construction
+        self._profile_layout = dict(
+            yaxis=dict(autorange='reversed', title='Pressure (dbar)'),
+            xaxis=dict(title='Temperature (°C)'),
+            height=600,
+            hovermode='closest'
+        )
+    
+    @cached_figure
     def create_temperature_profile(
         self,
         df: pd.DataFrame,
@@ -24,50 +101,65 @@ class ProfilePlotter:
             float_ids: Specific float IDs to plot
             title: Plot title
         """
-        fig = go.Figure()
-        
         if df.empty:
             return self._empty_figure(title)
         
+        fig = go.Figure(layout=self._profile_layout)
+        
         # Group by float_id and cycle_number
         if 'float_id' in df.columns and 'cycle_number' in df.columns:
-            groups = df.groupby(['float_id', 'cycle_number'])
+            df = _ensure_categorical(df)
+            df = df.dropna(subset=['float_id', 'cycle_number'])
+            if float_ids:
+                df = df[df['float_id'].isin(float_ids)]
+            
+            # Sort once so every profile is a contiguous, pressure-ordered block
+            order, offsets = _sort_profiles(df)
+            df = df.iloc[order]
+            fids = df['float_id'].to_numpy()
+            cycles = df['cycle_number'].to_numpy()
+            cols = self._column_arrays(df, ['temperature', 'pressure'])
+            temperature, pressure = cols['temperature'], cols['pressure']
+            starts = offsets[1:-1]
             
-            for (fid, cycle), group in groups:
-                if float_ids and fid not in float_ids:
-                    continue
-                
-                group = group.sort_values('pressure')
+            if len(offsets) - 1 <= MAX_PROFILE_TRACES:
+                for lo, hi in zip(offsets[:-1], offsets[1:]):
+                    fig.add_trace(go.Scatter(
+                        x=temperature[lo:hi],
+                        y=pressure[lo:hi],
+                        mode='lines+markers',
+                        name=f"Float {fids[lo]} Cycle {cycles[lo]}",
+                        hovertemplate='Temp: %{x:.2f}°C<br>Depth: %{y:.1f}m<extra></extra>'
+                    ))
+            else:
+                # One trace for all profiles; NaN rows break the line between them
+                labels = ('Float ' + df['float_id'].astype(str) + ' Cycle ' + df['cycle_number'].astype(str))
                 fig.add_trace(go.Scatter(
-                    x=group['temperature'],
-                    y=group['pressure'],
+                    x=np.insert(temperature, starts, np.nan),
+                    y=np.insert(pressure, starts, np.nan),
+                    customdata=np.insert(labels.to_numpy(dtype=object), starts, ''),
                     mode='lines+markers',
-                    name=f"Float {fid} Cycle {cycle}",
-                    hovertemplate='Temp: %{x:.2f}°C<br>Depth: %{y:.1f}m<extra></extra>'
+                    connectgaps=False,
+                    name='Profiles',
+                    hovertemplate='%{customdata}<br>Temp: %{x:.2f}°C<br>Depth: %{y:.1f}m<extra></extra>'
                 ))
         else:
             # Single profile
-            df = df.sort_values('pressure')
+            cols = self._column_arrays(df.sort_values('pressure'), ['temperature', 'pressure'])
             fig.add_trace(go.Scatter(
-                x=df['temperature'],
-                y=df['pressure'],
+                x=cols['temperature'],
+                y=cols['pressure'],
                 mode='lines+markers',
                 name='Profile',
                 hovertemplate='Temp: %{x:.2f}°C<br>Depth: %{y:.1f}m<extra></extra>'
             ))
         
         # Invert y-axis (depth increases downward)
-        fig.update_yaxes(autorange='reversed', title='Pressure (dbar)')
-        fig.update_xaxes(title='Temperature (°C)')
-        fig.update_layout(
-            title=title,
-            height=600,
-            hovermode='closest',
-            showlegend=True
-        )
+        fig.update_layout(title=title, showlegend=True)
         
         return fig
     
+    @cached_figure
     def create_ts_diagram(
         self,
         df: pd.DataFrame,
@@ -80,24 +172,36 @@ class ProfilePlotter:
         if df.empty:
             return self._empty_figure(title)
         
-        fig = px.scatter(
-            df,
-            x='salinity',
-            y='temperature',
-            color='pressure',
-            color_continuous_scale='Viridis',
-            labels={
-                'salinity': 'Salinity (PSU)',
-                'temperature': 'Temperature (°C)',
-                'pressure': 'Pressure (dbar)'
-            },
+        # Built directly as one WebGL trace: no plotly express introspection
+        cols = self._column_arrays(df, ['salinity', 'temperature', 'pressure', 'latitude', 'longitude'])
+        fig = go.Figure(go.Scattergl(
+            x=cols['salinity'],
+            y=cols['temperature'],
+            mode='markers',
+            marker=dict(
+                color=cols['pressure'],
+                colorscale='Viridis',
+                showscale=True,
+                colorbar=dict(title='Pressure (dbar)')
+            ),
+            customdata=np.column_stack([cols['latitude'], cols['longitude'], cols['pressure']]),
+            # Explicit formats: float32 values would otherwise show float noise
+            hovertemplate=(
+                'Salinity (PSU)=%{x:.3f}<br>Temperature (°C)=%{y:.3f}<br>'
+                'latitude=%{customdata[0]:.3f}<br>longitude=%{customdata[1]:.3f}<br>'
+                'Pressure (dbar)=%{customdata[2]:.1f}<extra></extra>'
+            )
+        ))
+        fig.update_layout(
             title=title,
-            hover_data=['latitude', 'longitude', 'pressure']
+            xaxis_title='Salinity (PSU)',
+            yaxis_title='Temperature (°C)',
+            height=600,
+            hovermode='closest'
         )
-        
-        fig.update_layout(height=600)
         return fig
     
+    @cached_figure
     def create_multi_parameter_profile(
         self,
         df: pd.DataFrame,
@@ -122,35 +226,40 @@ class ProfilePlotter:
             shared_yaxes=True
         )
         
-        df = df.sort_values('pressure')
+        # Subplot column of every parameter that has data; absent ones stay empty
+        present = {i: param for i, param in enumerate(parameters, 1) if param in df.columns}
+        cols = self._column_arrays(df.sort_values('pressure'), ['pressure', *present.values()])
         
-        for i, param in enumerate(parameters, 1):
-            if param not in df.columns:
-                continue
-            
-            fig.add_trace(
-                go.Scatter(
-                    x=df[param],
-                    y=df['pressure'],
-                    mode='lines+markers',
-                    name=param.capitalize(),
-                    showlegend=False
-                ),
-                row=1,
-                col=i
+        traces = [
+            go.Scatter(
+                x=cols[param],
+                y=cols['pressure'],
+                mode='lines+markers',
+                name=param.capitalize(),
+                showlegend=False,
+                hovertemplate=f'{param.capitalize()}: %{{x:.2f}}<br>Depth: %{{y:.1f}}m<extra></extra>'
             )
-            
-            fig.update_xaxes(title_text=param.capitalize(), row=1, col=i)
+            for param in present.values()
+        ]
+        fig.add_traces(traces, rows=[1] * len(traces), cols=list(present))
         
-        fig.update_yaxes(title_text='Pressure (dbar)', autorange='reversed', row=1, col=1)
+        # All axis titles in the same single layout update
+        axis_titles = {
+            f"xaxis{i if i > 1 else ''}_title_text": param.capitalize()
+            for i, param in present.items()
+        }
         fig.update_layout(
             title=title,
             height=600,
-            showlegend=False
+            showlegend=False,
+            yaxis_title_text='Pressure (dbar)',
+            yaxis_autorange='reversed',
+            **axis_titles
         )
         
         return fig
     
+    @cached_figure
     def create_profile_comparison(
         self,
         df: pd.DataFrame,
@@ -164,32 +273,44 @@ class ProfilePlotter:
         if df.empty:
             return self._empty_figure(title)
         
-        fig = go.Figure()
+        fig = go.Figure(layout=self._profile_layout)
         
         # Group data
         if group_by in df.columns:
-            groups = df.groupby(group_by)
+            df = _ensure_categorical(df)
+            
+            # One stable sort up front: groups come out in key order and
+            # already pressure-sorted, so no per-group sort is needed
+            df = df.sort_values([group_by, 'pressure'], kind='mergesort')
+            sizes = df.groupby(group_by, sort=False, observed=True).size()
             
-            for name, group in groups:
-                group = group.sort_values('pressure')
+            # Groups are contiguous blocks (missing keys sort last and are
+            # skipped), so each trace is a slice of arrays converted once
+            cols = self._column_arrays(df, ['temperature', 'pressure'])
+            offsets = np.concatenate([[0], np.cumsum(sizes.to_numpy())])
+            
+            for name, lo, hi in zip(sizes.index, offsets[:-1], offsets[1:]):
                 fig.add_trace(go.Scatter(
-                    x=group['temperature'],
-                    y=group['pressure'],
+                    x=cols['temperature'][lo:hi],
+                    y=cols['pressure'][lo:hi],
                     mode='lines',
                     name=str(name),
                     hovertemplate='Temp: %{x:.2f}°C<br>Depth: %{y:.1f}m<extra></extra>'
                 ))
         
-        fig.update_yaxes(autorange='reversed', title='Pressure (dbar)')
-        fig.update_xaxes(title='Temperature (°C)')
-        fig.update_layout(
-            title=title,
-            height=600,
-            hovermode='closest'
-        )
+        fig.update_layout(title=title)
         
         return fig
     
+    def _column_arrays(self, df: pd.DataFrame, columns: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Numeric columns as contiguous float32 arrays for Plotly.
+        Converted once per column, not per group; Arrow-backed float32
+        columns without nulls come through without a copy. float32 halves
+        the figure payload at no visible cost.
+        """
+        return {col: df[col].to_numpy(dtype=np.float32, na_value=np.nan) for col in columns}
+    
     def _empty_figure(self, title: str) -> go.Figure:
         """Create empty figure with message"""
         fig = go.Figure()